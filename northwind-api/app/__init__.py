@@ -1,15 +1,20 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 import logging
 from .config import Config
+from . import metrics
+from .json_provider import FastJSONProvider
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
 
     logging.basicConfig(level=Config.LOG_LEVEL)
     logger = logging.getLogger("northwind-api")
     logger.info("Northwind API starting")
 
+    metrics.init_app(app)
+
     # register blueprints
     from .controllers.customers import customers_bp
     from .controllers.products import products_bp
@@ -19,10 +24,25 @@ def create_app():
     app.register_blueprint(products_bp, url_prefix="/products")
     app.register_blueprint(orders_bp, url_prefix="/orders")
 
+    @app.after_request
+    def conditional_get(response):
+        # Content-hash ETag on buffered GET responses (items and list pages);
+        # a matching If-None-Match turns the response into a bodyless 304.
+        if request.method == "GET" and response.status_code == 200 and not response.is_streamed:
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+
     @app.route("/")
     def hello():
         return jsonify({"ok": True, "service": "northwind-api"})
 
+    @app.route("/cache-stats")
+    def cache_stats():
+        from .services.cache import cache_stats
+        from .services.search import product_index
+        return jsonify({**cache_stats(), "search": product_index.stats()})
+
     @app.errorhandler(404)
     def not_found(e):
         return jsonify({"error": "not found"}), 404
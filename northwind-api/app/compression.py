@@ -0,0 +1,91 @@
+"""
+Negotiated response compression for the Lambda/API Gateway boundary.
+
+aws_lambda_wsgi hands back the body as text, so compression happens on the
+finished proxy response: the body is gzip (or brotli, when the optional
+``brotli`` package is installed) compressed, base64 encoded and flagged
+with ``isBase64Encoded``. Bodies under Config.COMPRESSION_MIN_BYTES are
+sent as-is so small responses don't pay the CPU cost. A strong ETag
+computed on the uncompressed body is weakened, since the bytes sent differ.
+"""
+
+import base64
+import gzip
+from typing import Any, Dict, Optional
+
+from .config import Config
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+
+def _header(headers: Optional[Dict[str, str]], name: str) -> str:
+    for k, v in (headers or {}).items():
+        if k.lower() == name:
+            return v or ""
+    return ""
+
+
+def _accepted(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def decode_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    With binaryMediaTypes enabled API Gateway may base64 encode request
+    bodies; aws_lambda_wsgi expects plain text, so undo that here.
+    """
+    if event.get("isBase64Encoded") and event.get("body"):
+        event = dict(event, body=base64.b64decode(event["body"]).decode("utf-8"),
+                     isBase64Encoded=False)
+    return event
+
+
+def compress_response(event: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Compresses a proxy-integration response dict in place when worthwhile."""
+    body = result.get("body")
+    headers = result.setdefault("headers", {})
+    if result.get("isBase64Encoded") or not isinstance(body, str) or _header(headers, "content-encoding"):
+        return result
+
+    raw = body.encode("utf-8")
+    if len(raw) < Config.COMPRESSION_MIN_BYTES:
+        return result
+
+    encoding = choose_encoding(_header(event.get("headers"), "accept-encoding"))
+    if encoding is None:
+        return result
+
+    if encoding == "br":
+        compressed = brotli.compress(raw, quality=Config.COMPRESSION_LEVEL)
+    else:
+        compressed = gzip.compress(raw, compresslevel=Config.COMPRESSION_LEVEL)
+
+    for k in [k for k in headers if k.lower() == "content-length"]:
+        del headers[k]
+    for k in [k for k in headers if k.lower() == "etag"]:
+        if not headers[k].startswith("W/"):
+            headers[k] = "W/" + headers[k]
+    headers["Content-Encoding"] = encoding
+    headers["Vary"] = "Accept-Encoding"
+    result["body"] = base64.b64encode(compressed).decode("ascii")
+    result["isBase64Encoded"] = True
+    return result
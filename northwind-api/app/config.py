@@ -2,11 +2,13 @@
 """
 Central application configuration for both Flask and PynamoDB models.
 Loads values from environment variables (set by Serverless in Lambda),
-and provides a Config class + helper for PynamoDB Meta blocks.
+and provides a Config class + helper for PynamoDB Meta blocks, plus the
+shared botocore DynamoDB client every model talks through.
 """
 
 import os
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Tuple
 
 
 class Config:
@@ -23,6 +25,71 @@ class Config:
     # Logging level with safe fallback
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # List endpoints return bounded pages; clients can ask for up to MAX_PAGE_SIZE
+    DEFAULT_PAGE_SIZE: int = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+    MAX_PAGE_SIZE: int = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+
+    # Cap on NDJSON responses (0 = unbounded). Under Lambda aws_lambda_wsgi
+    # buffers the whole stream into one string, so it is bounded there.
+    NDJSON_MAX_ITEMS: int = int(os.getenv(
+        "NDJSON_MAX_ITEMS", "10000" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "0"))
+
+    # Parallel scan: number of Segment workers and how many items may sit in memory
+    SCAN_SEGMENTS: int = int(os.getenv("SCAN_SEGMENTS", "4"))
+    SCAN_MAX_BUFFERED: int = int(os.getenv("SCAN_MAX_BUFFERED", "1000"))
+
+    # Upper bound on ids accepted by the batch-get endpoints
+    MAX_BATCH_GET_IDS: int = int(os.getenv("MAX_BATCH_GET_IDS", "300"))
+
+    # Bulk import: max items per request and backoff for unprocessed BatchWriteItem items
+    MAX_BULK_ITEMS: int = int(os.getenv("MAX_BULK_ITEMS", "500"))
+    BATCH_WRITE_MAX_RETRIES: int = int(os.getenv("BATCH_WRITE_MAX_RETRIES", "5"))
+    BATCH_WRITE_BASE_DELAY: float = float(os.getenv("BATCH_WRITE_BASE_DELAY", "0.05"))
+    # Concurrent UpdateItem calls of a bulk customer import
+    BULK_UPDATE_CONCURRENCY: int = int(os.getenv("BULK_UPDATE_CONCURRENCY", "16"))
+
+    # In-process item cache kept across warm invocations (0 disables)
+    CACHE_MAX_ITEMS: int = int(os.getenv("CACHE_MAX_ITEMS", "1024"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+    # Orders GSI customer history reads from. customerId-index (hash only) is
+    # the pre-migration index; history then filters order_date instead of
+    # using it as a key condition. Switch once customerId-orderDate-index is ACTIVE.
+    ORDER_HISTORY_INDEX: str = os.getenv("ORDER_HISTORY_INDEX", "customerId-orderDate-index")
+
+    # Write shards of the customer country index. Readers query every shard,
+    # so changing this needs the index keys of existing customers rewritten.
+    COUNTRY_SHARDS: int = int(os.getenv("COUNTRY_SHARDS", "4"))
+
+    # Write shards of the sparse pending-shipments order index
+    PENDING_SHARDS: int = int(os.getenv("PENDING_SHARDS", "4"))
+
+    # Date-range order listing over the per-day order index
+    DATE_RANGE_MAX_DAYS: int = int(os.getenv("DATE_RANGE_MAX_DAYS", "366"))
+    DATE_BUCKET_CONCURRENCY: int = int(os.getenv("DATE_BUCKET_CONCURRENCY", "8"))
+
+    # In-memory product name search index (0 disables the periodic rebuild)
+    SEARCH_REBUILD_SECONDS: float = float(os.getenv("SEARCH_REBUILD_SECONDS", "300"))
+    SEARCH_DEFAULT_LIMIT: int = int(os.getenv("SEARCH_DEFAULT_LIMIT", "10"))
+    SEARCH_MAX_RESULTS: int = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+
+    # Response compression: bodies smaller than this are sent uncompressed
+    COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    COMPRESSION_LEVEL: int = int(os.getenv("COMPRESSION_LEVEL", "5"))
+
+    # Shared DynamoDB connection pool. The pool must cover parallel scan and
+    # fan-out workers, otherwise they queue on a handful of sockets.
+    DDB_MAX_POOL_CONNECTIONS: int = int(os.getenv("DDB_MAX_POOL_CONNECTIONS", "50"))
+    DDB_CONNECT_TIMEOUT: float = float(os.getenv("DDB_CONNECT_TIMEOUT", "2"))
+    DDB_READ_TIMEOUT: float = float(os.getenv("DDB_READ_TIMEOUT", "5"))
+    DDB_MAX_RETRY_ATTEMPTS: int = int(os.getenv("DDB_MAX_RETRY_ATTEMPTS", "3"))
+    DDB_RETRY_MODE: str = os.getenv("DDB_RETRY_MODE", "standard")
+    DDB_TCP_KEEPALIVE: bool = os.getenv("DDB_TCP_KEEPALIVE", "true").lower() in ("1", "true", "yes")
+
+    # Request metrics: "emf" (CloudWatch Embedded Metric Format), "summary" (local p50/p95/p99) or "off"
+    METRICS_MODE: str = os.getenv("METRICS_MODE", "emf")
+    METRICS_NAMESPACE: str = os.getenv("METRICS_NAMESPACE", "NorthwindApi")
+
     @staticmethod
     def pynamodb_meta_for(table_name: str) -> Dict[str, Any]:
         """
@@ -41,3 +108,54 @@ class Config:
             meta["host"] = Config.DYNAMODB_ENDPOINT
 
         return meta
+
+    @staticmethod
+    def dynamodb_client(region: Optional[str] = None, host: Optional[str] = None):
+        """
+        Returns the process-wide botocore DynamoDB client for (region, host),
+        creating it on first use. One client means one connection pool, so
+        warm invocations and all models reuse the same TLS connections.
+        """
+        key = (region or Config.AWS_REGION, host)
+        client = _clients.get(key)
+        if client is None or not _has_credentials(client):
+            with _clients_lock:
+                client = _clients.get(key)
+                if client is None or not _has_credentials(client):
+                    client = _clients[key] = _create_client(*key)
+        return client
+
+
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _has_credentials(client) -> bool:
+    # botocore caches empty credentials (e.g. after a metadata service blip);
+    # such a client never recovers, so it is rebuilt, as PynamoDB does
+    signer = getattr(client, "_request_signer", None)
+    return signer is None or signer._credentials is not None
+
+
+def _create_client(region: str, host: Optional[str]):
+    # botocore is imported here, not at module level, to keep it off the cold-start path
+    import botocore.config
+    import botocore.session
+
+    config = botocore.config.Config(
+        parameter_validation=False,
+        connect_timeout=Config.DDB_CONNECT_TIMEOUT,
+        read_timeout=Config.DDB_READ_TIMEOUT,
+        max_pool_connections=Config.DDB_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=Config.DDB_TCP_KEEPALIVE,
+        retries={
+            "mode": Config.DDB_RETRY_MODE,
+            "total_max_attempts": 1 + Config.DDB_MAX_RETRY_ATTEMPTS,
+        },
+    )
+    session = botocore.session.get_session()
+    client = session.create_client("dynamodb", region, endpoint_url=host, config=config)
+
+    from .metrics import record_dynamodb_call
+    client.meta.events.register("after-call.dynamodb", record_dynamodb_call)
+    return client
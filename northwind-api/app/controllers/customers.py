@@ -1,10 +1,21 @@
 from flask import Blueprint, request, jsonify
+from ..schemas.compiled import compile_schema
 from ..schemas.customer_schema import CustomerSchema
-from ..services.customer_service import CustomerService
+from ..schemas.batch_schema import BatchGetSchema
+from ..config import Config
+from ..services.batch import bulk_summary
+from ..services.pagination import parse_page_args
+from ..services.projection import parse_fields
+from .streaming import ndjson_response, wants_ndjson
+from ..lazy import lazy_import
 from marshmallow import ValidationError
 
+CustomerService = lazy_import("app.services.customer_service", "CustomerService")
+CustomerModel = lazy_import("app.models.customer", "CustomerModel")
+
 customers_bp = Blueprint("customers", __name__)
-schema = CustomerSchema()
+schema = compile_schema(CustomerSchema())
+batch_get_schema = BatchGetSchema()
 
 @customers_bp.route("/", methods=["POST"])
 def create_customer():
@@ -16,13 +27,45 @@ def create_customer():
     created = CustomerService.create(data)
     return jsonify(created), 201
 
+@customers_bp.route("/bulk", methods=["POST"])
+def bulk_create_customers():
+    json_data = request.get_json(silent=True)
+    if not isinstance(json_data, list) or not json_data:
+        return jsonify({"error": "expected a non-empty JSON array"}), 400
+    if len(json_data) > Config.MAX_BULK_ITEMS:
+        return jsonify({"error": f"at most {Config.MAX_BULK_ITEMS} items per request"}), 400
+    try:
+        items = schema.load(json_data, many=True)
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
+    summary = bulk_summary(CustomerService.bulk_create(items))
+    return jsonify(summary), 201 if not summary["failed"] else 207
+
 @customers_bp.route("/<customer_id>", methods=["GET"])
 def get_customer(customer_id):
-    result = CustomerService.get(customer_id)
+    try:
+        fields = parse_fields(CustomerModel, request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    include_stats = "stats" in request.args.get("include", "").split(",")
+    if include_stats and fields is not None:
+        fields += [f for f in CustomerService.STATS_FIELDS if f not in fields]
+    result = CustomerService.get(customer_id, fields)
     if not result:
         return jsonify({"error": "not found"}), 404
+    if not include_stats and fields is None:
+        for name in CustomerService.STATS_FIELDS:
+            result.pop(name, None)
     return jsonify(result)
 
+@customers_bp.route("/batch-get", methods=["POST"])
+def batch_get_customers():
+    try:
+        data = batch_get_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
+    return jsonify(CustomerService.batch_get(data["ids"]))
+
 @customers_bp.route("/<customer_id>", methods=["PUT", "PATCH"])
 def update_customer(customer_id):
     json_data = request.get_json()
@@ -37,4 +80,19 @@ def update_customer(customer_id):
 
 @customers_bp.route("/", methods=["GET"])
 def list_customers():
-    return jsonify(CustomerService.list_all())
+    country = request.args.get("country")
+    city = request.args.get("city")
+    try:
+        if city and not country:
+            raise ValueError("city requires country")
+        fields = parse_fields(CustomerModel, request.args.get("fields"))
+        if wants_ndjson():
+            if country:
+                return ndjson_response(CustomerService.iter_by_country(country, city, fields))
+            return ndjson_response(CustomerService.iter_all(fields))
+        limit, start_key = parse_page_args(request.args)
+        if country:
+            return jsonify(CustomerService.by_country_page(country, limit, start_key, city, fields))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(CustomerService.list_page(limit, start_key, fields))
@@ -1,10 +1,22 @@
+from datetime import datetime, timedelta, timezone
 from flask import Blueprint, request, jsonify
 from marshmallow import ValidationError
+from app.schemas.compiled import compile_schema
 from app.schemas.order_schema import OrderSchema
-from app.services.order_service import OrderService
+from app.config import Config
+from app.services.batch import bulk_summary
+from app.services.pagination import parse_page_args
+from app.services.projection import parse_fields
+from app.controllers.streaming import ndjson_response, wants_ndjson
+from app.lazy import lazy_import
+
+OrderService = lazy_import("app.services.order_service", "OrderService")
+expand_products = lazy_import("app.services.order_service", "expand_products")
+iter_expanded = lazy_import("app.services.order_service", "iter_expanded")
+OrderModel = lazy_import("app.models.order", "OrderModel")
 
 orders_bp = Blueprint("orders", __name__)
-schema = OrderSchema()
+schema = compile_schema(OrderSchema())
 
 
 @orders_bp.route("/", methods=["POST"])
@@ -16,11 +28,66 @@ def create_order():
     return jsonify(OrderService.create(data)), 201
 
 
+@orders_bp.route("/bulk", methods=["POST"])
+def bulk_create_orders():
+    json_data = request.get_json(silent=True)
+    if not isinstance(json_data, list) or not json_data:
+        return jsonify({"error": "expected a non-empty JSON array"}), 400
+    if len(json_data) > Config.MAX_BULK_ITEMS:
+        return jsonify({"error": f"at most {Config.MAX_BULK_ITEMS} items per request"}), 400
+    try:
+        items = schema.load(json_data, many=True)
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
+    summary = bulk_summary(OrderService.bulk_create(items))
+    return jsonify(summary), 201 if not summary["failed"] else 207
+
+
+@orders_bp.route("/", methods=["GET"])
+def list_orders():
+    try:
+        start = _parse_when(request.args.get("from"))
+        end = _parse_when(request.args.get("to"), end_of_day=True)
+        if start is None or end is None:
+            raise ValueError("from and to are required")
+        if start > end:
+            raise ValueError("from must not be after to")
+        if (end - start).days >= Config.DATE_RANGE_MAX_DAYS:
+            raise ValueError(f"at most {Config.DATE_RANGE_MAX_DAYS} days per request")
+        fields = parse_fields(OrderModel, request.args.get("fields"))
+        if wants_ndjson():
+            return ndjson_response(OrderService.list_by_date_range(start, end, fields))
+        limit, start_key = parse_page_args(request.args)
+        return jsonify(OrderService.date_range_page(start, end, limit, start_key, fields))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@orders_bp.route("/pending", methods=["GET"])
+def pending_orders():
+    ship_via = request.args.get("ship_via")
+    try:
+        fields = parse_fields(OrderModel, request.args.get("fields"))
+        if wants_ndjson():
+            return ndjson_response(OrderService.iter_pending(ship_via, fields))
+        limit, start_key = parse_page_args(request.args)
+        return jsonify(OrderService.pending_page(limit, start_key, ship_via, fields))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
 @orders_bp.route("/<order_id>", methods=["GET"])
 def get_order(order_id):
-    result = OrderService.get(order_id)
+    try:
+        fields = parse_fields(OrderModel, request.args.get("fields"))
+        expand = _wants_product_expansion()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = OrderService.get(order_id, fields)
     if not result:
         return jsonify({"error": "not found"}), 404
+    if expand:
+        expand_products([result])
     return jsonify(result)
 
 
@@ -38,4 +105,49 @@ def update_order(order_id):
 
 @orders_bp.route("/customer/<customer_id>/history", methods=["GET"])
 def customer_history(customer_id):
-    return jsonify(OrderService.order_history(customer_id))
+    try:
+        fields = parse_fields(OrderModel, request.args.get("fields"),
+                              always=("customer_id", "order_date"))
+        start = _parse_when(request.args.get("from"))
+        end = _parse_when(request.args.get("to"), end_of_day=True)
+        newest_first = request.args.get("order", "desc") != "asc"
+        expand = _wants_product_expansion()
+        if wants_ndjson():
+            orders = OrderService.iter_history(customer_id, fields, start, end, newest_first)
+            return ndjson_response(iter_expanded(orders) if expand else orders)
+        limit, start_key = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    page = OrderService.history_page(customer_id, limit, start_key, fields, start, end, newest_first)
+    if expand:
+        expand_products(page["items"])
+    return jsonify(page)
+
+
+def _wants_product_expansion():
+    expand = {e.strip() for e in request.args.get("expand", "").split(",") if e.strip()}
+    unknown = expand - {"products"}
+    if unknown:
+        raise ValueError("unsupported expand: " + ", ".join(sorted(unknown)))
+    return "products" in expand
+
+
+def _parse_when(raw, end_of_day=False):
+    """
+    Parses an ISO date or datetime query value into an aware UTC datetime
+    (naive values are taken as UTC), so bounds can always be compared.
+    A bare date used as an upper bound covers that whole day.
+    """
+    if not raw:
+        return None
+    try:
+        when = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"invalid date: {raw}")
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    else:
+        when = when.astimezone(timezone.utc)
+    if end_of_day and len(raw) == 10:
+        when += timedelta(days=1, microseconds=-1)
+    return when
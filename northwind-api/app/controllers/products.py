@@ -1,10 +1,21 @@
 from flask import Blueprint, request, jsonify
 from marshmallow import ValidationError
+from ..schemas.compiled import compile_schema
 from ..schemas.product_schema import ProductSchema
-from ..services.product_service import ProductService
+from ..schemas.batch_schema import BatchGetSchema
+from ..config import Config
+from ..services.batch import bulk_summary
+from ..services.pagination import parse_page_args
+from ..services.projection import parse_fields
+from .streaming import ndjson_response, wants_ndjson
+from ..lazy import lazy_import
+
+ProductService = lazy_import("app.services.product_service", "ProductService")
+ProductModel = lazy_import("app.models.product", "ProductModel")
 
 products_bp = Blueprint("products", __name__)
-_schema = ProductSchema()
+_schema = compile_schema(ProductSchema())
+_batch_get_schema = BatchGetSchema()
 
 @products_bp.route("/", methods=["POST"])
 def create_product():
@@ -16,13 +27,53 @@ def create_product():
     created = ProductService.create(data)
     return jsonify(created), 201
 
+@products_bp.route("/bulk", methods=["POST"])
+def bulk_create_products():
+    json_data = request.get_json(silent=True)
+    if not isinstance(json_data, list) or not json_data:
+        return jsonify({"error": "expected a non-empty JSON array"}), 400
+    if len(json_data) > Config.MAX_BULK_ITEMS:
+        return jsonify({"error": f"at most {Config.MAX_BULK_ITEMS} items per request"}), 400
+    try:
+        items = _schema.load(json_data, many=True)
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
+    summary = bulk_summary(ProductService.bulk_create(items))
+    return jsonify(summary), 201 if not summary["failed"] else 207
+
+@products_bp.route("/search", methods=["GET"])
+def search_products():
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    try:
+        limit = int(request.args.get("limit", Config.SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    limit = min(limit, Config.SEARCH_MAX_RESULTS)
+    return jsonify({"items": ProductService.search(query, limit)})
+
 @products_bp.route("/<product_id>", methods=["GET"])
 def get_product(product_id):
-    res = ProductService.get(product_id)
+    try:
+        fields = parse_fields(ProductModel, request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    res = ProductService.get(product_id, fields)
     if not res:
         return jsonify({"error": "not found"}), 404
     return jsonify(res)
 
+@products_bp.route("/batch-get", methods=["POST"])
+def batch_get_products():
+    try:
+        data = _batch_get_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as e:
+        return jsonify({"error": e.messages}), 400
+    return jsonify(ProductService.batch_get(data["ids"]))
+
 @products_bp.route("/<product_id>", methods=["PUT", "PATCH"])
 def update_product(product_id):
     json_data = request.get_json(silent=True) or {}
@@ -37,4 +88,34 @@ def update_product(product_id):
 
 @products_bp.route("/", methods=["GET"])
 def list_products():
-    return jsonify(ProductService.list_all())
+    category = request.args.get("category")
+    try:
+        fields = parse_fields(ProductModel, request.args.get("fields"))
+        min_price = _parse_price(request.args.get("min_price"), "min_price")
+        max_price = _parse_price(request.args.get("max_price"), "max_price")
+        if not category and (min_price is not None or max_price is not None):
+            raise ValueError("min_price/max_price require category")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price must not exceed max_price")
+        if wants_ndjson():
+            if category:
+                return ndjson_response(ProductService.iter_category(category, min_price, max_price, fields))
+            return ndjson_response(ProductService.iter_all(fields))
+        limit, start_key = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if category:
+        return jsonify(ProductService.category_page(category, limit, start_key, fields,
+                                                    min_price, max_price))
+    return jsonify(ProductService.list_page(limit, start_key, fields))
+
+def _parse_price(raw, name):
+    if raw in (None, ""):
+        return None
+    try:
+        price = float(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+    if price < 0:
+        raise ValueError(f"{name} must not be negative")
+    return price
@@ -0,0 +1,47 @@
+from flask import Response, current_app, request, stream_with_context
+
+from ..config import Config
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson():
+    """True when the client prefers newline-delimited JSON over a JSON document."""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON])
+    return best == NDJSON
+
+
+def ndjson_response(items, max_items=None):
+    """
+    Streams `items` (any iterable, ideally a generator) as one JSON document
+    per line. Nothing is accumulated here, so memory stays flat with table
+    size when the app runs under a WSGI server that streams.
+
+    Under Lambda, aws_lambda_wsgi joins the whole body into one string
+    before returning it, so the stream is cut off after `max_items`
+    (default Config.NDJSON_MAX_ITEMS, 0 = no cap). The cap is announced in
+    an X-NDJSON-Max-Items header and a cut-off stream ends with a
+    {"truncated": true} line; clients should page through the JSON form
+    for anything larger.
+    """
+    if max_items is None:
+        max_items = Config.NDJSON_MAX_ITEMS
+
+    def generate():
+        dumps = current_app.json.dumps
+        try:
+            for n, item in enumerate(items):
+                if max_items and n == max_items:
+                    yield dumps({"truncated": True}) + "\n"
+                    return
+                yield dumps(item) + "\n"
+        finally:
+            # stop the underlying scan/query generator early when we cut off
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+
+    resp = Response(stream_with_context(generate()), mimetype=NDJSON)
+    if max_items:
+        resp.headers["X-NDJSON-Max-Items"] = str(max_items)
+    return resp
@@ -0,0 +1,62 @@
+"""
+Flask JSON provider used by every blueprint (jsonify, request.get_json and
+the NDJSON streamer all go through app.json).
+
+Backed by orjson when it is installed, which serializes datetime and
+Decimal natively and writes bytes straight into the response. PynamoDB
+MapAttribute values (e.g. OrderItem) are emitted from their
+attribute_values, so services can hand model data over as-is instead of
+rebuilding it into plain dicts first. Keys are sorted so the output, and
+the ETag derived from it, is stable.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+_ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "attribute_values"):
+        return obj.attribute_values
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+    mimetype = "application/json"
+
+    def dumpb(self, obj: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        return json.dumps(obj, default=_default, sort_keys=True,
+                          separators=(",", ":")).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumpb(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumpb(obj), mimetype=self.mimetype)
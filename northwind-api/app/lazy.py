@@ -0,0 +1,42 @@
+"""
+Deferred imports for cold-start sensitive modules.
+
+Controllers are imported by create_app(), which runs when the Lambda
+handler module loads. Importing the services and models there would pull
+in pynamodb and botocore before the first request even needs them.
+lazy_import() returns a proxy that performs the real import on first
+attribute access or call, then forwards to the target, so the cost is
+paid only when a route actually talks to DynamoDB.
+"""
+
+import importlib
+from typing import Any
+
+
+class LazyImport:
+    __slots__ = ("_module", "_attr", "_target")
+
+    def __init__(self, module: str, attr: str):
+        self._module = module
+        self._attr = attr
+        self._target = None
+
+    def _resolve(self) -> Any:
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._attr)
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<lazy {self._module}.{self._attr} ({state})>"
+
+
+def lazy_import(module: str, attr: str) -> Any:
+    """Lazy equivalent of ``from module import attr``."""
+    return LazyImport(module, attr)
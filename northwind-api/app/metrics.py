@@ -0,0 +1,183 @@
+"""
+Per-route latency and DynamoDB cost instrumentation.
+
+init_app() wires before_request/after_request hooks that time each request
+(for streamed responses, until the stream is closed) and collect, via a
+botocore ``after-call`` hook on the shared DynamoDB client, how many
+DynamoDB calls it made and how much read/write capacity they consumed
+(PynamoDB already asks for ReturnConsumedCapacity=TOTAL).
+
+Config.METRICS_MODE selects the output:
+  emf      one CloudWatch Embedded Metric Format JSON line per request (Lambda)
+  summary  keep samples in memory and print p50/p95/p99 per route at exit
+  off      do nothing
+"""
+
+import atexit
+import json
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, request
+
+from .config import Config
+
+READ_OPERATIONS = frozenset({"GetItem", "BatchGetItem", "Query", "Scan", "TransactGetItems"})
+
+
+class RequestMetrics:
+    __slots__ = ("started", "calls", "rcu", "wcu", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls = 0
+        self.rcu = 0.0
+        self.wcu = 0.0
+        self._lock = threading.Lock()
+
+    def add_call(self, operation: str, capacity: float) -> None:
+        # parallel scan workers report from their own threads
+        with self._lock:
+            self.calls += 1
+            if operation in READ_OPERATIONS:
+                self.rcu += capacity
+            else:
+                self.wcu += capacity
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+_samples: Dict[Tuple[str, str], List[Tuple[float, int, float, float]]] = {}
+_samples_lock = threading.Lock()
+
+
+def record_dynamodb_call(parsed=None, model=None, **kwargs) -> None:
+    """botocore ``after-call.dynamodb`` handler."""
+    metrics = _current.get()
+    if metrics is None or model is None:
+        return
+    consumed = (parsed or {}).get("ConsumedCapacity") or []
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    metrics.add_call(model.name, sum(c.get("CapacityUnits", 0) for c in consumed))
+
+
+def _emit_emf(route: str, method: str, status: int, m: RequestMetrics, latency_ms: float) -> None:
+    doc = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": Config.METRICS_NAMESPACE,
+                "Dimensions": [["Route", "Method"]],
+                "Metrics": [
+                    {"Name": "Latency", "Unit": "Milliseconds"},
+                    {"Name": "DynamoDBCalls", "Unit": "Count"},
+                    {"Name": "ConsumedRCU", "Unit": "Count"},
+                    {"Name": "ConsumedWCU", "Unit": "Count"},
+                ],
+            }],
+        },
+        "Route": route,
+        "Method": method,
+        "StatusCode": status,
+        "Latency": round(latency_ms, 3),
+        "DynamoDBCalls": m.calls,
+        "ConsumedRCU": m.rcu,
+        "ConsumedWCU": m.wcu,
+    }
+    # EMF must be a bare JSON line on stdout, not a formatted log record
+    sys.stdout.write(json.dumps(doc) + "\n")
+    sys.stdout.flush()
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    """Per-route latency percentiles and mean DynamoDB cost from summary mode."""
+    with _samples_lock:
+        snapshot = {k: list(v) for k, v in _samples.items()}
+    result = {}
+    for (method, route), rows in sorted(snapshot.items()):
+        latencies = sorted(r[0] for r in rows)
+        n = len(rows)
+        result[f"{method} {route}"] = {
+            "count": n,
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "ddb_calls": sum(r[1] for r in rows) / n,
+            "rcu": sum(r[2] for r in rows) / n,
+            "wcu": sum(r[3] for r in rows) / n,
+        }
+    return result
+
+
+def print_summary(out=None) -> None:
+    out = out or sys.stderr
+    rows = summary()
+    if not rows:
+        return
+    out.write(f"{'route':<45} {'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'calls':>6} {'rcu':>7} {'wcu':>7}\n")
+    for name, s in rows.items():
+        out.write(f"{name:<45} {s['count']:>6} {s['p50_ms']:>8.2f} {s['p95_ms']:>8.2f} "
+                  f"{s['p99_ms']:>8.2f} {s['ddb_calls']:>6.1f} {s['rcu']:>7.1f} {s['wcu']:>7.1f}\n")
+
+
+def _record(route: str, method: str, status: int, m: RequestMetrics) -> None:
+    latency_ms = (time.perf_counter() - m.started) * 1000
+    if Config.METRICS_MODE == "summary":
+        with _samples_lock:
+            _samples.setdefault((method, route), []).append((latency_ms, m.calls, m.rcu, m.wcu))
+    else:
+        _emit_emf(route, method, status, m, latency_ms)
+
+
+def reset() -> None:
+    with _samples_lock:
+        _samples.clear()
+
+
+def init_app(app: Flask) -> None:
+    if Config.METRICS_MODE == "off":
+        return
+
+    @app.before_request
+    def _start_metrics():
+        request.environ["northwind.metrics_token"] = _current.set(RequestMetrics())
+
+    @app.after_request
+    def _finish_metrics(response):
+        token = request.environ.pop("northwind.metrics_token", None)
+        m = _current.get()
+        if token is None or m is None:
+            return response
+
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        method, status = request.method, response.status_code
+        if not response.is_streamed:
+            _current.reset(token)
+            _record(route, method, status, m)
+            return response
+
+        # A streamed body (NDJSON) does its DynamoDB reads while the WSGI
+        # server iterates it, after this hook: keep collecting and record
+        # once the stream is closed.
+        def _finish_stream():
+            try:
+                _current.reset(token)
+            except ValueError:  # closed from another context
+                pass
+            _record(route, method, status, m)
+
+        response.call_on_close(_finish_stream)
+        return response
+
+    if Config.METRICS_MODE == "summary":
+        atexit.register(print_summary)
@@ -0,0 +1,56 @@
+# models/base.py
+"""
+Model base wiring every table to the shared DynamoDB client.
+
+This is the one place the app plugs into PynamoDB's connection layer, and
+it relies on PynamoDB 6.0.x (pinned in requirements.txt):
+``Model._get_connection()`` returns a ``TableConnection`` whose public
+``connection`` attribute is a ``pynamodb.connection.Connection``, and
+every request goes through ``Connection.client``. BaseModel swaps that
+Connection for SharedClientConnection once per model class. Revisit this
+module when upgrading PynamoDB.
+"""
+from pynamodb.connection import Connection
+from pynamodb.models import Model
+from ..config import Config
+
+
+class SharedClientConnection(Connection):
+    """
+    Connection whose ``client`` is the process-wide Config.dynamodb_client()
+    for its region/host rather than one botocore client per Connection.
+
+    PynamoDB's own ``client`` property also registers ``_before_send``,
+    which only adds Meta.extra_headers; a shared client cannot carry
+    per-connection headers, so a connection with extra_headers keeps
+    PynamoDB's own client. Config.dynamodb_client() handles the "client
+    with missing credentials" case PynamoDB guards against by rebuilding.
+    """
+
+    @property
+    def client(self):
+        if self._extra_headers:
+            return super().client
+        return Config.dynamodb_client(self.region, self.host)
+
+
+class BaseModel(Model):
+    """
+    Model base that routes every table through Config.dynamodb_client(),
+    so all models share one tuned botocore client and connection pool
+    instead of each building its own from Meta.
+    """
+
+    @classmethod
+    def _get_connection(cls):
+        table_connection = super()._get_connection()
+        connection = table_connection.connection
+        if not isinstance(connection, SharedClientConnection):
+            shared = SharedClientConnection(
+                region=cls.Meta.region,
+                host=getattr(cls.Meta, "host", None),
+                extra_headers=getattr(cls.Meta, "extra_headers", None),
+            )
+            shared.add_meta_table(connection.get_meta_table(cls.Meta.table_name))
+            table_connection.connection = shared
+        return table_connection
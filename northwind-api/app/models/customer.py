@@ -1,14 +1,22 @@
 # models/customer.py
 import os
-from pynamodb.models import Model
-from pynamodb.attributes import UnicodeAttribute
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
+from .base import BaseModel
 from ..config import Config  # keep if your package structure uses this
 
 DEFAULT_TABLE = os.environ.get("CUSTOMERS_TABLE", "Customers")
 DEFAULT_REGION = os.environ.get("AWS_REGION", getattr(Config, "AWS_REGION", "us-east-1"))
 DDB_ENDPOINT = os.environ.get("DYNAMODB_ENDPOINT", getattr(Config, "DYNAMODB_ENDPOINT", None))
 
-class CustomerModel(Model):
+class CountryShardIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "countryShard-index"
+        projection = AllProjection()
+    country_shard = UnicodeAttribute(hash_key=True)
+    city_key = UnicodeAttribute(range_key=True)
+
+class CustomerModel(BaseModel):
     class Meta:
         table_name = DEFAULT_TABLE
         region = DEFAULT_REGION
@@ -24,3 +32,17 @@ class CustomerModel(Model):
     city = UnicodeAttribute(null=True)
     country = UnicodeAttribute(null=True)
     phone = UnicodeAttribute(null=True)
+
+    # Keys of the write-sharded country index ("<country>#<shard>" and
+    # "<city>#<customer_id>"), derived from country/city by CustomerService
+    country_shard = UnicodeAttribute(null=True)
+    city_key = UnicodeAttribute(null=True)
+    country_index = CountryShardIndex()
+
+    # Lifetime order stats, maintained with atomic ADDs by OrderService writes
+    order_count = NumberAttribute(null=True)
+    total_spend = NumberAttribute(null=True)
+    last_order_date = UTCDateTimeAttribute(null=True)
+
+STATS_FIELDS = ("order_count", "total_spend", "last_order_date")
+INDEX_FIELDS = ("country_shard", "city_key")
@@ -1,6 +1,5 @@
 import os
 import datetime
-from pynamodb.models import Model
 from pynamodb.attributes import (
     UnicodeAttribute,
     ListAttribute,
@@ -10,6 +9,7 @@ from pynamodb.attributes import (
 )
 from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
 from app.config import Config
+from app.models.base import BaseModel
 
 
 class OrderItem(MapAttribute):
@@ -18,14 +18,47 @@ class OrderItem(MapAttribute):
     quantity = NumberAttribute()
 
 
-class CustomerIdIndex(GlobalSecondaryIndex):
+class LegacyCustomerIdIndex(GlobalSecondaryIndex):
+    """
+    The original hash-only customer index. Kept until customerId-orderDate-index
+    is ACTIVE everywhere and Config.ORDER_HISTORY_INDEX has been switched to it;
+    it is then dropped in a later deploy.
+    """
     class Meta:
         index_name = "customerId-index"
         projection = AllProjection()
     customer_id = UnicodeAttribute(hash_key=True)
 
 
-class OrderModel(Model):
+class CustomerIdIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "customerId-orderDate-index"
+        projection = AllProjection()
+    customer_id = UnicodeAttribute(hash_key=True)
+    order_date = UTCDateTimeAttribute(range_key=True)
+
+
+class PendingShipmentIndex(GlobalSecondaryIndex):
+    """
+    Sparse index of unshipped orders: OrderService only sets its keys while
+    shipped_date is empty, so shipped orders drop out of it.
+    """
+    class Meta:
+        index_name = "pendingShipment-index"
+        projection = AllProjection()
+    pending_shard = UnicodeAttribute(hash_key=True)
+    pending_key = UnicodeAttribute(range_key=True)
+
+
+class OrderDayIndex(GlobalSecondaryIndex):
+    class Meta:
+        index_name = "orderDay-index"
+        projection = AllProjection()
+    order_day = UnicodeAttribute(hash_key=True)
+    order_date = UTCDateTimeAttribute(range_key=True)
+
+
+class OrderModel(BaseModel):
     class Meta:
         table_name = os.environ.get("ORDERS_TABLE", "Orders")
         region = Config.AWS_REGION
@@ -35,7 +68,25 @@ class OrderModel(Model):
     order_id = UnicodeAttribute(hash_key=True)
     customer_id = UnicodeAttribute(null=False)
     customer_index = CustomerIdIndex()
-    order_date = UTCDateTimeAttribute(default=datetime.datetime.utcnow)
+    legacy_customer_index = LegacyCustomerIdIndex()
+    order_date = UTCDateTimeAttribute(default=lambda: datetime.datetime.now(datetime.timezone.utc))
+    # UTC day of order_date ("YYYY-MM-DD"), the partition of the day index
+    order_day = UnicodeAttribute(null=True)
+    day_index = OrderDayIndex()
     shipped_date = UTCDateTimeAttribute(null=True)
     ship_via = UnicodeAttribute(null=True)
     items = ListAttribute(of=OrderItem)
+
+    # Aggregates over `items`, maintained by OrderService on every write
+    line_count = NumberAttribute(null=True)
+    item_count = NumberAttribute(null=True)
+    subtotal = NumberAttribute(null=True)
+
+    # Keys of the pending-shipment index ("pending#<shard>" and
+    # "<ship_via>#<order_date>#<order_id>"), present only while unshipped
+    pending_shard = UnicodeAttribute(null=True)
+    pending_key = UnicodeAttribute(null=True)
+    pending_index = PendingShipmentIndex()
+
+
+INDEX_FIELDS = ("order_day", "pending_shard", "pending_key")
@@ -1,14 +1,27 @@
 # models/product.py
 import os
-from pynamodb.models import Model
 from pynamodb.attributes import UnicodeAttribute, NumberAttribute
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
+from .base import BaseModel
 from ..config import Config
 
 DEFAULT_TABLE = os.environ.get("PRODUCTS_TABLE", "Products")
 DEFAULT_REGION = os.environ.get("AWS_REGION", getattr(Config, "AWS_REGION", "us-east-1"))
 DDB_ENDPOINT = os.environ.get("DYNAMODB_ENDPOINT", getattr(Config, "DYNAMODB_ENDPOINT", None))
 
-class ProductModel(Model):
+class CategoryPriceIndex(GlobalSecondaryIndex):
+    """
+    Products by category, cheapest first. unit_price is the sort key, so a
+    product with a category but no unit_price is not in this index and
+    does not show up in category listings until it is given a price.
+    """
+    class Meta:
+        index_name = "category-unitPrice-index"
+        projection = AllProjection()
+    category = UnicodeAttribute(hash_key=True)
+    unit_price = NumberAttribute(range_key=True)
+
+class ProductModel(BaseModel):
     class Meta:
         table_name = DEFAULT_TABLE
         region = DEFAULT_REGION
@@ -19,5 +32,6 @@ class ProductModel(Model):
     product_name = UnicodeAttribute(null=False)
     supplier_id = UnicodeAttribute(null=True)
     category = UnicodeAttribute(null=True)
+    category_index = CategoryPriceIndex()
     unit_price = NumberAttribute(null=True)
     units_in_stock = NumberAttribute(null=True)
@@ -0,0 +1,9 @@
+from marshmallow import Schema, fields, validate
+from ..config import Config
+
+class BatchGetSchema(Schema):
+    ids = fields.List(
+        fields.Str(validate=validate.Length(min=1)),
+        required=True,
+        validate=validate.Length(min=1, max=Config.MAX_BATCH_GET_IDS),
+    )
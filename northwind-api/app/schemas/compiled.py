@@ -0,0 +1,123 @@
+"""
+Compiled fast-path loaders for the request schemas.
+
+compile_schema() turns a marshmallow Schema into a generated Python
+function, specialized once per schema, that checks and converts the common
+well-formed payload with plain type checks. That skips marshmallow's
+generic per-field machinery. Values the fast path does not recognise are
+handed to the field's own deserialize(). If anything is invalid, the
+payload is re-run through ``schema.load`` so errors keep exactly the shape
+of ``ValidationError.messages``.
+
+Schemas with hooks (pre_load, validates, ...) or unusual options are not
+compiled; their CompiledSchema simply delegates to marshmallow.
+"""
+
+import math
+from typing import Any, Callable, Dict
+
+from marshmallow import EXCLUDE, INCLUDE, Schema, ValidationError, fields
+from marshmallow.utils import missing
+
+
+class _Fallback(Exception):
+    """Raised by generated code when marshmallow has to take over."""
+
+
+def _compile(schema: Schema) -> Callable[[Dict, bool], Dict]:
+    if any(schema._hooks.values()) or schema.unknown in (EXCLUDE, INCLUDE):
+        raise _Fallback
+    ns: Dict[str, Any] = {
+        "_Fallback": _Fallback, "ValidationError": ValidationError,
+        "_isfinite": math.isfinite, "_missing": missing,
+    }
+    known = set()
+    lines = ["def _load(data, partial):",
+             "    if type(data) is not dict or not _known.issuperset(data):",
+             "        raise _Fallback",
+             "    out = {}"]
+
+    for i, (name, field) in enumerate(schema.load_fields.items()):
+        key = field.data_key or name
+        known.add(key)
+        ns[f"_f{i}"] = field
+        ns[f"_v{i}"] = tuple(field.validators)
+        lines += [f"    v = data.get({key!r}, _missing)",
+                  "    if v is _missing:"]
+        lines += ["        if not partial:"]
+        if field.required:
+            lines += ["            raise _Fallback"]
+        elif field.load_default is not missing:
+            lines += [f"            d = _f{i}.load_default",
+                      f"            out[{name!r}] = d() if callable(d) else d"]
+        else:
+            lines += ["            pass"]
+        lines += ["    else:"]
+        if field.allow_none:
+            lines += ["        if v is None:",
+                      f"            out[{name!r}] = None",
+                      "        else:"]
+            indent = " " * 12
+        else:
+            lines += ["        if v is None:", "            raise _Fallback"]
+            indent = " " * 8
+        lines += [indent + l for l in _convert(field, i, name, key, ns)]
+        lines += [indent + f"for val in _v{i}:",
+                  indent + "    if val(v) is False:",
+                  indent + "        raise _Fallback",
+                  indent + f"out[{name!r}] = v"]
+
+    lines.append("    return out")
+    ns["_known"] = frozenset(known)
+    exec("\n".join(lines), ns)
+    return ns["_load"]
+
+
+def _convert(field, i: int, name: str, key: str, ns: Dict[str, Any]):
+    """Source lines converting `v` for one field; falls back to field.deserialize()."""
+    slow = f"v = _f{i}.deserialize(v, {name!r}, data)"
+    if type(field) is fields.String:
+        return ["if type(v) is not str:", "    " + slow]
+    if type(field) is fields.Integer:
+        return ["if type(v) is not int:", "    " + slow]
+    if type(field) is fields.Float and not field.allow_nan and not field.as_string:
+        return ["if type(v) is int:", "    v = float(v)",
+                "elif type(v) is not float or not _isfinite(v):", "    " + slow]
+    if type(field) is fields.Nested and not field.many and isinstance(field.schema, Schema):
+        ns[f"_n{i}"] = _compile(field.schema)
+        return ["v = _n%d(v, partial)" % i]
+    if (type(field) is fields.List and type(field.inner) is fields.Nested
+            and not field.inner.many and isinstance(field.inner.schema, Schema)):
+        # marshmallow hands `partial` down to List(Nested) items as well
+        ns[f"_n{i}"] = _compile(field.inner.schema)
+        return ["if type(v) is not list:", "    raise _Fallback",
+                f"v = [_n{i}(x, partial) for x in v]"]
+    return [slow]
+
+
+class CompiledSchema:
+    """Drop-in for the ``load`` method of a marshmallow schema instance."""
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        try:
+            self._fast = _compile(schema)
+        except _Fallback:
+            self._fast = None
+
+    def load(self, data, *, many: bool = False, partial: bool = False):
+        if self._fast is not None and partial in (True, False):
+            try:
+                if many:
+                    if type(data) is not list:
+                        raise _Fallback
+                    return [self._fast(d, partial) for d in data]
+                return self._fast(data, partial)
+            except (_Fallback, ValidationError, TypeError, ValueError):
+                pass
+        # error reporting (and anything the fast path doesn't cover)
+        return self.schema.load(data, many=many, partial=partial)
+
+
+def compile_schema(schema: Schema) -> CompiledSchema:
+    return CompiledSchema(schema)
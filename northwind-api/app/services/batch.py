@@ -0,0 +1,145 @@
+"""
+Helpers around DynamoDB batch operations shared by the services.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import Config
+
+logger = logging.getLogger("northwind-api")
+
+# DynamoDB limits for a single BatchWriteItem / BatchGetItem call
+BATCH_WRITE_CHUNK = 25
+BATCH_GET_CHUNK = 100
+
+
+def read_batch(model, ids: List[str], attributes_to_get: Optional[List[str]] = None
+               ) -> Tuple[List[Any], List[str]]:
+    """
+    Reads `ids` with BatchGetItem, BATCH_GET_CHUNK keys per call.
+
+    PynamoDB's Model.batch_get re-requests UnprocessedKeys immediately and
+    without limit, which under throttling hammers the table. Here they are
+    retried with the same exponential backoff and Config.BATCH_WRITE_MAX_RETRIES
+    limit as bulk_write(). Returns (instances, ids still unprocessed).
+    """
+    hash_attr = model._hash_key_attribute()
+    unique_ids = list(dict.fromkeys(ids))
+    found: List[Any] = []
+    unprocessed: List[str] = []
+
+    for start in range(0, len(unique_ids), BATCH_GET_CHUNK):
+        keys = [{hash_attr.attr_name: model._serialize_keys(i)[0]}
+                for i in unique_ids[start:start + BATCH_GET_CHUNK]]
+        attempt = 0
+        while keys:
+            page, keys = model._batch_get_page(keys, consistent_read=None,
+                                               attributes_to_get=attributes_to_get)
+            found.extend(model.from_raw_data(raw) for raw in page or [])
+            if not keys:
+                break
+            attempt += 1
+            if attempt > Config.BATCH_WRITE_MAX_RETRIES:
+                unprocessed.extend(_key_id(hash_attr, k) for k in keys)
+                break
+            delay = Config.BATCH_WRITE_BASE_DELAY * (2 ** (attempt - 1))
+            logger.info("Retrying %d unprocessed %s reads in %.2fs",
+                        len(keys), model.Meta.table_name, delay)
+            time.sleep(delay)
+    return found, unprocessed
+
+
+def _key_id(hash_attr, key: Dict[str, Any]) -> Any:
+    # our own keys carry the serialized value, DynamoDB's UnprocessedKeys a {"S": ...} map
+    value = key[hash_attr.attr_name]
+    if isinstance(value, dict):
+        value = value[hash_attr.attr_type]
+    return hash_attr.deserialize(value)
+
+
+def batch_get(model, ids: List[str], serialize: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Reads `ids` with read_batch(). Returns the found items in request order,
+    the ids that do not exist and the ids DynamoDB still left unprocessed
+    after the retries (those may exist; the client should ask again).
+    """
+    to_dict = serialize or (lambda r: r.attribute_values)
+    hash_key = model._hash_keyname
+    unique_ids = list(dict.fromkeys(ids))
+
+    instances, unprocessed = read_batch(model, unique_ids)
+    found = {getattr(r, hash_key): to_dict(r) for r in instances}
+    skipped = set(unprocessed)
+
+    return {
+        "items": [found[i] for i in unique_ids if i in found],
+        "missing": [i for i in unique_ids if i not in found and i not in skipped],
+        "unprocessed": [i for i in unique_ids if i in skipped],
+    }
+
+
+def bulk_write(model, instances: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Writes model `instances` with Model.batch_write() in chunks of 25.
+
+    Items DynamoDB leaves unprocessed (or whole chunks that fail, e.g. on
+    throttling) are retried with exponential backoff up to
+    Config.BATCH_WRITE_MAX_RETRIES times. Returns one result per instance,
+    in input order: {"id", "status": "created"|"failed"[, "error"]}.
+    """
+    # imported here: controllers import this module for bulk_summary() at
+    # cold start, before anything needs pynamodb
+    from pynamodb.exceptions import PutError
+
+    hash_key = model._hash_keyname
+    hash_attr = model._hash_key_attribute().attr_name
+    results: List[Dict[str, Any]] = [
+        {"id": getattr(inst, hash_key), "status": "created"} for inst in instances
+    ]
+
+    seen = set()
+    pending = []
+    for idx, inst in enumerate(instances):
+        key = getattr(inst, hash_key)
+        if key in seen:
+            results[idx].update(status="failed", error="duplicate id in request")
+            continue
+        seen.add(key)
+        pending.append((idx, inst))
+
+    for start in range(0, len(pending), BATCH_WRITE_CHUNK):
+        chunk = pending[start:start + BATCH_WRITE_CHUNK]
+        attempt = 0
+        while chunk:
+            batch = model.batch_write(auto_commit=False)
+            for _, inst in chunk:
+                batch.save(inst)
+            try:
+                batch.commit()
+                break
+            except PutError as e:
+                unprocessed = {
+                    op["PutRequest"]["Item"][hash_attr]["S"]
+                    for op in (batch.failed_operations or [])
+                    if "PutRequest" in op
+                }
+                if unprocessed:
+                    chunk = [(i, inst) for i, inst in chunk if getattr(inst, hash_key) in unprocessed]
+                attempt += 1
+                if attempt > Config.BATCH_WRITE_MAX_RETRIES:
+                    for i, _ in chunk:
+                        results[i].update(status="failed", error=str(e))
+                    break
+                delay = Config.BATCH_WRITE_BASE_DELAY * (2 ** (attempt - 1))
+                logger.info("Retrying %d unprocessed %s writes in %.2fs",
+                            len(chunk), model.Meta.table_name, delay)
+                time.sleep(delay)
+
+    return results
+
+
+def bulk_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    failed = sum(1 for r in results if r["status"] != "created")
+    return {"created": len(results) - failed, "failed": failed, "results": results}
@@ -0,0 +1,85 @@
+"""
+Small in-process read-through cache for hot item lookups.
+
+Instances live at module scope, so in Lambda they survive between
+invocations of a warm container. Entries expire after a TTL and the
+least recently used entry is evicted once the cache is full. A TTL or size
+of 0 disables caching.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from ..config import Config
+
+
+class TTLCache:
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader: Callable[[Any], Optional[Dict]]) -> Optional[Dict]:
+        """Returns a copy of the cached item, calling `loader` on a miss. None is not cached."""
+        value = self.get(key)
+        if value is None:
+            value = loader(key)
+            if value is None:
+                return None
+            self.set(key, value)
+        return dict(value)
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+                    "hits": self.hits, "misses": self.misses}
+
+
+product_cache = TTLCache("products", Config.CACHE_MAX_ITEMS, Config.CACHE_TTL_SECONDS)
+customer_cache = TTLCache("customers", Config.CACHE_MAX_ITEMS, Config.CACHE_TTL_SECONDS)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {c.name: c.stats() for c in (product_cache, customer_cache)}
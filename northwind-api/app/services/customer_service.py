@@ -1,32 +1,204 @@
-from ..models.customer import CustomerModel
-from pynamodb.exceptions import DoesNotExist
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import Config
+from ..models.customer import CustomerModel, INDEX_FIELDS, STATS_FIELDS
+from pynamodb.exceptions import DoesNotExist, UpdateError
+from . import batch
+from .cache import customer_cache
+from .pagination import page_of
+from .projection import project
+from .parallel_scan import parallel_scan
+from .sharding import iter_shards, query_shards_page, shard_for, sharded_key
+from .updates import update_item
+
+
+def index_keys(customer_id, country, city):
+    """Country index keys for a customer; customers without a country stay out of the index."""
+    if not country:
+        return {"country_shard": None, "city_key": None}
+    return {"country_shard": sharded_key(country, shard_for(customer_id, Config.COUNTRY_SHARDS)),
+            "city_key": f"{city or ''}#{customer_id}"}
+
+
+def _public(item):
+    for name in INDEX_FIELDS:
+        item.pop(name, None)
+    return item
+
+
+def _country_query(country, city):
+    hash_keys = [sharded_key(country, s) for s in range(Config.COUNTRY_SHARDS)]
+    condition = CustomerModel.city_key.startswith(f"{city}#") if city else None
+    return hash_keys, condition
+
+
+def _build_customer(data):
+    keys = index_keys(data["customer_id"], data.get("country"), data.get("city"))
+    return CustomerModel(**data, **{k: v for k, v in keys.items() if v is not None})
+
+
+# Everything a create/import writes; the order stats are left to record_orders()
+PROFILE_FIELDS = tuple(name for name in CustomerModel.get_attributes()
+                       if name != CustomerModel._hash_keyname and name not in STATS_FIELDS)
+
+
+def _put_profile(c):
+    """
+    Replaces the profile of `c` with one UpdateItem (creating the item if
+    needed) instead of a PutItem, so the stats of an existing customer
+    survive being re-created or re-imported. Loads the stored item into `c`.
+    """
+    actions = []
+    for name in PROFILE_FIELDS:
+        attr, value = getattr(CustomerModel, name), getattr(c, name)
+        actions.append(attr.remove() if value is None else attr.set(value))
+    c.update(actions=actions)
+    customer_cache.invalidate(c.customer_id)
+
 
 class CustomerService:
+    STATS_FIELDS = STATS_FIELDS
+
     @staticmethod
     def create(data):
-        c = CustomerModel(**data)
-        c.save()
-        return c.attribute_values
+        c = _build_customer(data)
+        _put_profile(c)
+        return _public(c.attribute_values)
+
+    @staticmethod
+    def bulk_create(items):
+        """
+        Imports customers with one profile UpdateItem each (BatchWriteItem can
+        only put whole items, which would wipe the stats of existing
+        customers), Config.BULK_UPDATE_CONCURRENCY at a time. Returns one
+        result per item like batch.bulk_write().
+        """
+        results = [{"id": data["customer_id"], "status": "created"} for data in items]
+        seen, pending = set(), []
+        for result, data in zip(results, items):
+            if result["id"] in seen:
+                result.update(status="failed", error="duplicate id in request")
+                continue
+            seen.add(result["id"])
+            pending.append((result, _build_customer(data)))
+        if not pending:
+            return results
+
+        def write(result, c):
+            try:
+                _put_profile(c)
+            except UpdateError as e:
+                result.update(status="failed", error=str(e))
+
+        workers = min(Config.BULK_UPDATE_CONCURRENCY, len(pending))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as pool:
+            futures = [pool.submit(contextvars.copy_context().run, write, result, c)
+                       for result, c in pending]
+            for f in futures:
+                f.result()
+        return results
+
+    @staticmethod
+    def get(customer_id, fields=None):
+        if fields is None:
+            return customer_cache.get_or_load(customer_id, CustomerService._fetch)
+        cached = customer_cache.get(customer_id)
+        if cached is not None:
+            return project(cached, fields)
+        return CustomerService._fetch(customer_id, fields)
 
     @staticmethod
-    def get(customer_id):
+    def _fetch(customer_id, fields=None):
         try:
-            c = CustomerModel.get(customer_id)
-            return c.attribute_values
+            c = CustomerModel.get(customer_id, attributes_to_get=fields)
+            return _public(c.attribute_values)
         except DoesNotExist:
             return None
 
+    @staticmethod
+    def batch_get(ids):
+        found = batch.batch_get(CustomerModel, ids)
+        for item in found["items"]:
+            _public(item)
+        return found
+
     @staticmethod
     def update(customer_id, patch):
-        try:
-            c = CustomerModel.get(customer_id)
-            for k,v in patch.items():
-                setattr(c, k, v)
-            c.save()
-            return c.attribute_values
-        except DoesNotExist:
+        if "country" in patch or "city" in patch:
+            # the index keys depend on both, so fill in whichever is not changing
+            try:
+                current = CustomerModel.get(customer_id, attributes_to_get=["country", "city"])
+            except DoesNotExist:
+                return None
+            country = patch.get("country", current.country)
+            city = patch.get("city", current.city)
+            patch = {**patch, **index_keys(customer_id, country, city)}
+        c = update_item(CustomerModel, customer_id, patch)
+        if c is None:
             return None
+        customer_cache.invalidate(customer_id)
+        return _public(c.attribute_values)
+
+    @staticmethod
+    def list_all(fields=None):
+        return list(CustomerService.iter_all(fields))
 
     @staticmethod
-    def list_all():
-        return [r.attribute_values for r in CustomerModel.scan()]
+    def iter_all(fields=None):
+        for r in parallel_scan(CustomerModel, attributes_to_get=fields):
+            yield _public(r.attribute_values)
+
+    @staticmethod
+    def list_page(limit, last_evaluated_key=None, fields=None):
+        return page_of(CustomerModel.scan(limit=limit, last_evaluated_key=last_evaluated_key,
+                                          attributes_to_get=fields),
+                       lambda c: _public(c.attribute_values))
+
+    @staticmethod
+    def iter_by_country(country, city=None, fields=None):
+        hash_keys, condition = _country_query(country, city)
+        for c in iter_shards(CustomerModel, CustomerModel.country_index, hash_keys,
+                             Config.MAX_PAGE_SIZE, range_key_condition=condition,
+                             attributes_to_get=fields):
+            yield _public(c)
+
+    @staticmethod
+    def by_country_page(country, limit, cursor=None, city=None, fields=None):
+        """
+        One page of a country's customers (optionally one city), ordered by
+        city. Every write shard is queried in parallel and the pages merged.
+        """
+        hash_keys, condition = _country_query(country, city)
+        page = query_shards_page(CustomerModel, CustomerModel.country_index, hash_keys, limit,
+                                 cursor, range_key_condition=condition, attributes_to_get=fields)
+        for c in page["items"]:
+            _public(c)
+        return page
+
+    @staticmethod
+    def record_orders(customer_id, order_count=0, spend=0, last_order_date=None):
+        """
+        Folds new or changed orders into the customer's stats with an atomic
+        ADD, then moves last_order_date forward if `last_order_date` is newer.
+        Orders for unknown customers are ignored rather than creating a stub.
+        """
+        exists = CustomerModel.customer_id.exists()
+        c = CustomerModel(customer_id)
+        try:
+            if order_count or spend:
+                c.update(
+                    actions=[CustomerModel.order_count.add(order_count),
+                             CustomerModel.total_spend.add(spend)],
+                    condition=exists,
+                )
+            if last_order_date is not None:
+                c.update(
+                    actions=[CustomerModel.last_order_date.set(last_order_date)],
+                    condition=exists & (CustomerModel.last_order_date.does_not_exist()
+                                        | (CustomerModel.last_order_date < last_order_date)),
+                )
+        except UpdateError as e:
+            if e.cause_response_code != "ConditionalCheckFailedException":
+                raise
+        customer_cache.invalidate(customer_id)
@@ -1,62 +1,242 @@
-from typing import Dict, List, Optional
-from app.models.order import OrderModel, OrderItem
+import contextvars
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+from pynamodb.constants import ALL_OLD, ATTRIBUTES
+from app.config import Config
+from app.models.order import INDEX_FIELDS, OrderModel, OrderItem
+from app.services.batch import bulk_write, read_batch
+from app.services.pagination import encode_token, page_of
+from app.services.parallel_scan import parallel_scan
+from app.services.customer_service import CustomerService
+from app.services.product_service import ProductService
+from app.services.projection import project
+from app.services.sharding import iter_shards, query_shards_page, shard_for, sharded_key
+from app.services.updates import update_item
 
 
-def serialize(obj):
-    if hasattr(obj, "attribute_values"):
-        return serialize(obj.attribute_values)
-    if isinstance(obj, dict):
-        return {k: serialize(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [serialize(v) for v in obj]
-    return obj
+def order_totals(items: List[Dict]) -> Dict:
+    """line_count, item_count and subtotal for a list of validated order items."""
+    return {
+        "line_count": len(items),
+        "item_count": sum(i["quantity"] for i in items),
+        "subtotal": round(sum((i.get("unit_price") or 0) * i["quantity"] for i in items), 2),
+    }
+
+
+def pending_keys(order_id: str, ship_via: Optional[str], order_date: datetime,
+                 shipped_date: Optional[datetime]) -> Dict:
+    """Pending-shipment index keys for an order; None for both once it has shipped."""
+    if shipped_date is not None:
+        return {"pending_shard": None, "pending_key": None}
+    order_date = _utc(order_date)
+    return {
+        "pending_shard": sharded_key("pending", shard_for(order_id, Config.PENDING_SHARDS)),
+        "pending_key": f"{ship_via or ''}#{order_date.strftime('%Y-%m-%dT%H:%M:%S.%f')}#{order_id}",
+    }
+
+
+def _utc(when: datetime) -> datetime:
+    """Aware datetime in UTC; naive datetimes are taken as UTC."""
+    if when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc)
+
+
+def order_day(when: datetime) -> str:
+    """Day bucket of an order_date in the day index."""
+    return _utc(when).strftime("%Y-%m-%d")
+
+
+def day_buckets(start: datetime, end: datetime) -> List[str]:
+    """Every day bucket from start to end inclusive."""
+    first, last = _utc(start).date(), _utc(end).date()
+    return [(first + timedelta(days=n)).isoformat() for n in range((last - first).days + 1)]
+
+
+def _public(item: Dict) -> Dict:
+    for name in INDEX_FIELDS:
+        item.pop(name, None)
+    return item
+
+
+def _build_order(data: Dict) -> OrderModel:
+    order = OrderModel(
+        order_id=data["order_id"],
+        customer_id=data["customer_id"],
+        items=[
+            OrderItem(
+                product_id=i["product_id"],
+                quantity=i["quantity"],
+                unit_price=i.get("unit_price")
+            )
+            for i in data["items"]
+        ],
+        **order_totals(data["items"])
+    )
+
+    # aware UTC throughout, so dates of one request always compare
+    order.order_date = _utc(data.get("order_date") or datetime.now(timezone.utc))
+    if "ship_via" in data:
+        order.ship_via = data["ship_via"]
+    if "shipped_date" in data:
+        order.shipped_date = data["shipped_date"]
+    order.order_day = order_day(order.order_date)
+    for name, value in pending_keys(order.order_id, order.ship_via, order.order_date,
+                                    order.shipped_date).items():
+        setattr(order, name, value)
+    return order
+
+
+def _date_condition(start: Optional[datetime], end: Optional[datetime]):
+    """Range-key condition on order_date for the customer index, or None."""
+    if start and end:
+        return OrderModel.order_date.between(start, end)
+    if start:
+        return OrderModel.order_date >= start
+    if end:
+        return OrderModel.order_date <= end
+    return None
+
+
+def _previous_orders(order_ids: List[str]) -> Dict[str, OrderModel]:
+    """customer_id/subtotal of any orders a bulk create is about to overwrite."""
+    attrs = ["order_id", "customer_id", "subtotal"]
+    found, unprocessed = read_batch(OrderModel, order_ids, attributes_to_get=attrs)
+    for order_id in unprocessed:
+        try:
+            found.append(OrderModel.get(order_id, attributes_to_get=attrs))
+        except OrderModel.DoesNotExist:
+            pass
+    return {o.order_id: o for o in found}
+
+
+def _save(order: OrderModel) -> Dict[str, OrderModel]:
+    """
+    Saves `order`, returning the order it replaced (if any) keyed by id.
+    The PutItem asks for ALL_OLD, so no separate read is needed.
+    """
+    args, kwargs = order._get_save_args()
+    data = OrderModel._get_connection().put_item(*args, return_values=ALL_OLD, **kwargs)
+    if not data.get(ATTRIBUTES):
+        return {}
+    return {order.order_id: OrderModel.from_raw_data(data[ATTRIBUTES])}
+
+
+def _record_stats(orders: List[OrderModel], previous: Dict[str, OrderModel]) -> None:
+    """
+    Folds written orders into customer stats, one update per customer.
+    An order that replaced an existing one only contributes the difference,
+    and moves between customers if its customer_id changed.
+    """
+    per_customer: Dict[str, Dict] = {}
+
+    def stats_for(customer_id):
+        return per_customer.setdefault(customer_id, {"order_count": 0, "spend": 0,
+                                                     "last_order_date": None})
+
+    for order in orders:
+        old = previous.pop(order.order_id, None)
+        if old is not None:
+            stats = stats_for(old.customer_id)
+            stats["order_count"] -= 1
+            stats["spend"] -= old.subtotal or 0
+        stats = stats_for(order.customer_id)
+        stats["order_count"] += 1
+        stats["spend"] += order.subtotal or 0
+        if stats["last_order_date"] is None or order.order_date > stats["last_order_date"]:
+            stats["last_order_date"] = order.order_date
+    for customer_id, stats in per_customer.items():
+        stats["spend"] = round(stats["spend"], 2)
+        if stats["order_count"] or stats["spend"] or stats["last_order_date"] is not None:
+            CustomerService.record_orders(customer_id, **stats)
+
+
+def _pending_query(ship_via: Optional[str]):
+    hash_keys = [sharded_key("pending", s) for s in range(Config.PENDING_SHARDS)]
+    condition = OrderModel.pending_key.startswith(f"{ship_via}#") if ship_via else None
+    return hash_keys, condition
+
+
+def _history_query(customer_id: str, start: Optional[datetime], end: Optional[datetime],
+                   newest_first: bool, **kwargs):
+    """
+    Customer history Query against Config.ORDER_HISTORY_INDEX. On the legacy
+    hash-only index the date range becomes a filter and the order follows
+    that index, not order_date.
+    """
+    if Config.ORDER_HISTORY_INDEX == OrderModel.legacy_customer_index.Meta.index_name:
+        return OrderModel.legacy_customer_index.query(
+            customer_id, filter_condition=_date_condition(start, end), **kwargs)
+    return OrderModel.customer_index.query(
+        customer_id,
+        range_key_condition=_date_condition(start, end),
+        scan_index_forward=not newest_first,
+        **kwargs,
+    )
+
+
+def expand_products(orders: List[Dict]) -> List[Dict]:
+    """
+    Inlines the current product record as item["product"] on every line item,
+    reading all distinct product ids in one batched call.
+    """
+    ids = {i["product_id"] for o in orders for i in o.get("items") or []}
+    if not ids:
+        return orders
+    found = {p["product_id"]: p for p in ProductService.batch_get(sorted(ids))["items"]}
+    for o in orders:
+        if o.get("items"):
+            o["items"] = [dict(i.attribute_values if hasattr(i, "attribute_values") else i,
+                               product=found.get(i["product_id"]))
+                          for i in o["items"]]
+    return orders
+
+
+def iter_expanded(orders: Iterator[Dict], chunk_size: int = 100) -> Iterator[Dict]:
+    """Streaming variant of expand_products(): one batched read per chunk of orders."""
+    chunk: List[Dict] = []
+    for order in orders:
+        chunk.append(order)
+        if len(chunk) == chunk_size:
+            yield from expand_products(chunk)
+            chunk = []
+    if chunk:
+        yield from expand_products(chunk)
 
 
 class OrderService:
     @staticmethod
     def create(data: Dict) -> Dict:
-        order = OrderModel(
-            order_id=data["order_id"],
-            customer_id=data["customer_id"],
-            items=[
-                OrderItem(
-                    product_id=i["product_id"],
-                    quantity=i["quantity"],
-                    unit_price=i.get("unit_price")
-                )
-                for i in data["items"]
-            ]
-        )
-
-        if "ship_via" in data:
-            order.ship_via = data["ship_via"]
-        if "shipped_date" in data:
-            order.shipped_date = data["shipped_date"]
+        order = _build_order(data)
+        _record_stats([order], _save(order))
+        return _public(order.attribute_values)
 
-        order.save()
-        return serialize(order.attribute_values)
+    @staticmethod
+    def bulk_create(items: List[Dict]) -> List[Dict]:
+        orders = [_build_order(data) for data in items]
+        previous = _previous_orders([o.order_id for o in orders])
+        results = bulk_write(OrderModel, orders)
+        _record_stats([o for o, r in zip(orders, results) if r["status"] == "created"], previous)
+        return results
 
     @staticmethod
-    def get(order_id: str) -> Optional[Dict]:
+    def get(order_id: str, fields: Optional[List[str]] = None) -> Optional[Dict]:
         try:
-            order = OrderModel.get(order_id)
-            return serialize(order.attribute_values)
+            order = OrderModel.get(order_id, attributes_to_get=fields)
+            return project(_public(order.attribute_values), fields)
         except OrderModel.DoesNotExist:
             return None
 
     @staticmethod
     def update(order_id: str, data: Dict) -> Optional[Dict]:
-        try:
-            order = OrderModel.get(order_id)
-        except OrderModel.DoesNotExist:
-            return None
-
-        for key in ("ship_via", "shipped_date"):
-            if key in data:
-                setattr(order, key, data[key])
+        patch = {key: data[key] for key in ("ship_via", "shipped_date") if key in data}
 
         if "items" in data:
-            order.items = [
+            patch["items"] = [
                 OrderItem(
                     product_id=i["product_id"],
                     quantity=i["quantity"],
@@ -64,13 +244,176 @@ class OrderService:
                 )
                 for i in data["items"]
             ]
+            patch.update(order_totals(data["items"]))
+
+        # the pending index keys depend on ship_via, order_date and shipped_date
+        reindex = "ship_via" in patch or "shipped_date" in patch
+        if reindex and patch.get("shipped_date") is not None:
+            patch.update(pending_keys(order_id, None, None, patch["shipped_date"]))  # removes them
+            reindex = False
+        if "items" in data or reindex:
+            try:
+                previous = OrderModel.get(order_id, attributes_to_get=[
+                    "subtotal", "ship_via", "order_date", "shipped_date"])
+            except OrderModel.DoesNotExist:
+                return None
+            if reindex:
+                patch.update(pending_keys(order_id, patch.get("ship_via", previous.ship_via),
+                                          previous.order_date,
+                                          patch.get("shipped_date", previous.shipped_date)))
+
+        order = update_item(OrderModel, order_id, patch)
+        if order is None:
+            return None
+        if "items" in data:
+            delta = (order.subtotal or 0) - (previous.subtotal or 0)
+            if delta:
+                CustomerService.record_orders(order.customer_id, spend=delta)
+        return _public(order.attribute_values)
+
+    @staticmethod
+    def order_history(customer_id: str, fields: Optional[List[str]] = None,
+                      start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      newest_first: bool = True) -> List[Dict]:
+        return list(OrderService.iter_history(customer_id, fields, start, end, newest_first))
+
+    @staticmethod
+    def iter_history(customer_id: str, fields: Optional[List[str]] = None,
+                     start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     newest_first: bool = True) -> Iterator[Dict]:
+        for order in _history_query(customer_id, start, end, newest_first,
+                                    attributes_to_get=fields):
+            yield project(_public(order.attribute_values), fields)
+
+    @staticmethod
+    def history_page(customer_id: str, limit: int, last_evaluated_key: Optional[Dict] = None,
+                     fields: Optional[List[str]] = None, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, newest_first: bool = True) -> Dict:
+        results = _history_query(customer_id, start, end, newest_first, limit=limit,
+                                 last_evaluated_key=last_evaluated_key, attributes_to_get=fields)
+        return page_of(results, lambda o: project(_public(o.attribute_values), fields))
+
+    @staticmethod
+    def iter_pending(ship_via: Optional[str] = None,
+                     fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        hash_keys, condition = _pending_query(ship_via)
+        for order in iter_shards(OrderModel, OrderModel.pending_index, hash_keys,
+                                 Config.MAX_PAGE_SIZE, range_key_condition=condition,
+                                 attributes_to_get=fields):
+            yield _public(order)
+
+    @staticmethod
+    def pending_page(limit: int, cursor: Optional[Dict] = None, ship_via: Optional[str] = None,
+                     fields: Optional[List[str]] = None) -> Dict:
+        """
+        One page of unshipped orders, by carrier and then oldest first, read
+        from the sparse pending-shipment index (cost follows open orders only).
+        """
+        hash_keys, condition = _pending_query(ship_via)
+        page = query_shards_page(OrderModel, OrderModel.pending_index, hash_keys, limit, cursor,
+                                 range_key_condition=condition, attributes_to_get=fields)
+        for order in page["items"]:
+            _public(order)
+        return page
 
-        order.save()
-        return serialize(order.attribute_values)
+    @staticmethod
+    def list_by_date_range(start: datetime, end: datetime,
+                           fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Streams every order placed between start and end, oldest first.
+        Day buckets are queried concurrently, a bounded number ahead of the
+        one being yielded, and come out in day order. Each day's worker hands
+        over one Query page (Config.MAX_PAGE_SIZE items) at a time through a
+        one-slot queue, so an upcoming day holds at most two pages in memory.
+        """
+        condition = _date_condition(start, end)
+        stop = threading.Event()
+        done = object()
+
+        def put(buf, obj) -> bool:
+            # block while the consumer is behind, but notice when it has gone
+            while not stop.is_set():
+                try:
+                    buf.put(obj, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch(day, buf):
+            try:
+                key = None
+                while True:
+                    results = OrderModel.day_index.query(
+                        day, range_key_condition=condition, limit=Config.MAX_PAGE_SIZE,
+                        last_evaluated_key=key, attributes_to_get=fields)
+                    page = [project(_public(o.attribute_values), fields) for o in results]
+                    key = results.last_evaluated_key
+                    if page and not put(buf, page):
+                        return
+                    if key is None:
+                        return
+            except Exception as e:  # surfaced to the consumer
+                put(buf, e)
+            finally:
+                put(buf, done)
+
+        def start_day(day):
+            buf: "queue.Queue[object]" = queue.Queue(maxsize=1)
+            # copy the caller's context so request metrics follow the fan-out
+            pool.submit(contextvars.copy_context().run, fetch, day, buf)
+            return buf
+
+        days = iter(day_buckets(start, end))
+        window = max(1, Config.DATE_BUCKET_CONCURRENCY)
+        pool = ThreadPoolExecutor(max_workers=window, thread_name_prefix="day")
+        try:
+            pending = [start_day(d) for d in itertools.islice(days, window)]
+            while pending:
+                buf = pending.pop(0)
+                while True:
+                    page = buf.get()
+                    if page is done:
+                        break
+                    if isinstance(page, Exception):
+                        raise page
+                    yield from page
+                pending.extend(start_day(d) for d in itertools.islice(days, 1))
+        finally:
+            stop.set()
+            pool.shutdown(wait=True)
+
+    @staticmethod
+    def date_range_page(start: datetime, end: datetime, limit: int,
+                        cursor: Optional[Dict] = None,
+                        fields: Optional[List[str]] = None) -> Dict:
+        """
+        One page of list_by_date_range(). Buckets are read in order until the
+        page is full; the cursor holds the current day and its LastEvaluatedKey.
+        """
+        days = day_buckets(start, end)
+        day, key = days[0], None
+        if cursor is not None:
+            day, key = cursor.get("day"), cursor.get("key")
+            if day not in days or not (key is None or isinstance(key, dict)):
+                raise ValueError("invalid next_token")
+        condition = _date_condition(start, end)
+        items: List[Dict] = []
+        for day in days[days.index(day):]:
+            results = OrderModel.day_index.query(day, range_key_condition=condition,
+                                                 limit=limit - len(items), last_evaluated_key=key,
+                                                 attributes_to_get=fields)
+            items.extend(project(_public(o.attribute_values), fields) for o in results)
+            key = results.last_evaluated_key
+            if len(items) == limit:
+                break
+        if key is None:
+            following = days.index(day) + 1
+            if following == len(days):
+                return {"items": items, "next_token": None}
+            day = days[following]
+        return {"items": items, "next_token": encode_token({"day": day, "key": key})}
 
     @staticmethod
-    def order_history(customer_id: str) -> List[Dict]:
-        return [
-            serialize(order.attribute_values)
-            for order in OrderModel.customer_index.query(customer_id)
-        ]
+    def list_all() -> List[Dict]:
+        return [_public(order.attribute_values) for order in parallel_scan(OrderModel)]
@@ -0,0 +1,68 @@
+"""
+Cursor pagination helpers shared by the service layer.
+
+DynamoDB hands back a ``LastEvaluatedKey`` when a Scan/Query page stops
+early. We expose it to clients as an opaque, URL-safe ``next_token`` so
+they can resume without knowing anything about the table's key schema.
+"""
+
+import base64
+import json
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..config import Config
+
+
+def encode_token(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Turns a DynamoDB LastEvaluatedKey into an opaque cursor string."""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_token(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Reverses encode_token(). Raises ValueError for anything that was not
+    produced by encode_token() so controllers can answer with a 400.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+        key = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("invalid next_token") from e
+    if not isinstance(key, dict):
+        raise ValueError("invalid next_token")
+    return key
+
+
+def parse_page_args(args: Mapping[str, str]) -> Tuple[int, Optional[Dict[str, Any]]]:
+    """
+    Reads ``limit`` and ``next_token`` from a query-string mapping.
+    The limit is clamped to Config.MAX_PAGE_SIZE.
+    """
+    raw_limit = args.get("limit")
+    if raw_limit in (None, ""):
+        limit = Config.DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+    limit = min(limit, Config.MAX_PAGE_SIZE)
+    return limit, decode_token(args.get("next_token"))
+
+
+def page_of(results, serialize=None) -> Dict[str, Any]:
+    """
+    Drains a bounded PynamoDB ResultIterator into a response page.
+    `results` must have been created with a `limit` so this reads at most
+    one page's worth of items.
+    """
+    to_dict = serialize or (lambda r: r.attribute_values)
+    items = [to_dict(r) for r in results]
+    return {"items": items, "next_token": encode_token(results.last_evaluated_key)}
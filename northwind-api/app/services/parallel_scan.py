@@ -0,0 +1,92 @@
+"""
+Parallel segmented Scan for full-table reads (exports, backfills, list_all).
+
+The table is split into ``total_segments`` logical segments; each one is
+scanned by its own worker thread and items are handed to the caller via a
+bounded queue. The queue size is the back-pressure knob: once it is full,
+workers block until the consumer catches up, so memory stays bounded no
+matter how large the table is.
+"""
+
+import contextvars
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional, Sequence
+
+from ..config import Config
+
+_DONE = object()
+
+
+class _WorkerError:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def parallel_scan(
+    model,
+    total_segments: Optional[int] = None,
+    max_buffered: Optional[int] = None,
+    filter_condition: Any = None,
+    attributes_to_get: Optional[Sequence[str]] = None,
+    page_size: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Yields every item of `model` using `total_segments` concurrent Scan workers.
+
+    Items arrive in no particular order. If a worker fails, the exception is
+    re-raised in the consumer and the remaining workers are stopped. Closing
+    the generator early also stops the workers.
+    """
+    total_segments = total_segments or Config.SCAN_SEGMENTS
+    max_buffered = max_buffered or Config.SCAN_MAX_BUFFERED
+    buf: "queue.Queue[Any]" = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(obj) -> bool:
+        # Block while the buffer is full, but wake up regularly to notice
+        # that the consumer has gone away.
+        while not stop.is_set():
+            try:
+                buf.put(obj, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(segment: int) -> None:
+        try:
+            for item in model.scan(
+                segment=segment,
+                total_segments=total_segments,
+                filter_condition=filter_condition,
+                attributes_to_get=attributes_to_get,
+                page_size=page_size,
+            ):
+                if not put(item):
+                    return
+        except Exception as e:  # surfaced to the consumer
+            put(_WorkerError(e))
+        finally:
+            put(_DONE)
+
+    pool = ThreadPoolExecutor(max_workers=total_segments, thread_name_prefix="scan")
+    try:
+        for segment in range(total_segments):
+            # each worker runs in a copy of the caller's context so request
+            # scoped state (e.g. metrics) follows the scan into the pool
+            pool.submit(contextvars.copy_context().run, worker, segment)
+
+        remaining = total_segments
+        while remaining:
+            obj = buf.get()
+            if obj is _DONE:
+                remaining -= 1
+            elif isinstance(obj, _WorkerError):
+                raise obj.exc
+            else:
+                yield obj
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
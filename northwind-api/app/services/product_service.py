@@ -1,32 +1,111 @@
 from ..models.product import ProductModel
 from pynamodb.exceptions import DoesNotExist
+from . import batch
+from .cache import product_cache
+from .pagination import page_of
+from .projection import project
+from .search import product_index, search_doc
+from .parallel_scan import parallel_scan
+from .updates import update_item
+
+def _price_condition(min_price=None, max_price=None):
+    """Range-key condition on unit_price for the category index, or None."""
+    if min_price is not None and max_price is not None:
+        return ProductModel.unit_price.between(min_price, max_price)
+    if min_price is not None:
+        return ProductModel.unit_price >= min_price
+    if max_price is not None:
+        return ProductModel.unit_price <= max_price
+    return None
 
 class ProductService:
     @staticmethod
     def create(data):
         p = ProductModel(**data)
         p.save()
+        product_cache.invalidate(p.product_id)
+        product_index.upsert(search_doc(p.attribute_values))
         return p.attribute_values
 
     @staticmethod
-    def get(product_id):
+    def bulk_create(items):
+        results = batch.bulk_write(ProductModel, [ProductModel(**data) for data in items])
+        for data, r in zip(items, results):
+            product_cache.invalidate(r["id"])
+            if r["status"] == "created":
+                product_index.upsert(search_doc(data))
+        return results
+
+    @staticmethod
+    def get(product_id, fields=None):
+        if fields is None:
+            return product_cache.get_or_load(product_id, ProductService._fetch)
+        cached = product_cache.get(product_id)
+        if cached is not None:
+            return project(cached, fields)
+        return ProductService._fetch(product_id, fields)
+
+    @staticmethod
+    def _fetch(product_id, fields=None):
         try:
-            p = ProductModel.get(product_id)
+            p = ProductModel.get(product_id, attributes_to_get=fields)
             return p.attribute_values
         except DoesNotExist:
             return None
 
+    @staticmethod
+    def batch_get(ids):
+        return batch.batch_get(ProductModel, ids)
+
     @staticmethod
     def update(product_id, patch):
-        try:
-            p = ProductModel.get(product_id)
-            for k,v in patch.items():
-                setattr(p, k, v)
-            p.save()
-            return p.attribute_values
-        except DoesNotExist:
+        p = update_item(ProductModel, product_id, patch)
+        if p is None:
             return None
+        product_cache.invalidate(product_id)
+        product_index.upsert(search_doc(p.attribute_values))
+        return p.attribute_values
+
+    @staticmethod
+    def search(query, limit):
+        return product_index.search(query, limit)
+
+    @staticmethod
+    def list_all(fields=None):
+        return list(ProductService.iter_all(fields))
+
+    @staticmethod
+    def iter_all(fields=None):
+        for r in parallel_scan(ProductModel, attributes_to_get=fields):
+            yield r.attribute_values
+
+    @staticmethod
+    def list_page(limit, last_evaluated_key=None, fields=None):
+        return page_of(ProductModel.scan(limit=limit, last_evaluated_key=last_evaluated_key,
+                                          attributes_to_get=fields))
+
+    @staticmethod
+    def iter_category(category, min_price=None, max_price=None, fields=None):
+        for p in ProductModel.category_index.query(
+            category,
+            range_key_condition=_price_condition(min_price, max_price),
+            attributes_to_get=fields,
+        ):
+            yield project(p.attribute_values, fields)
 
     @staticmethod
-    def list_all():
-        return [r.attribute_values for r in ProductModel.scan()]
+    def category_page(category, limit, last_evaluated_key=None, fields=None,
+                      min_price=None, max_price=None):
+        """
+        One page of a category, cheapest first, straight off the category
+        index. Products without a unit_price are not in the index and are
+        not returned.
+        """
+        results = ProductModel.category_index.query(
+            category,
+            range_key_condition=_price_condition(min_price, max_price),
+            limit=limit,
+            last_evaluated_key=last_evaluated_key,
+            attributes_to_get=fields,
+        )
+        return page_of(results, lambda p: project(p.attribute_values, fields))
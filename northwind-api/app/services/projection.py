@@ -0,0 +1,42 @@
+"""
+Sparse fieldsets: turns a ``?fields=a,b,c`` query parameter into the
+attribute list PynamoDB sends as a ProjectionExpression.
+"""
+
+from typing import Iterable, List, Optional
+
+
+def parse_fields(model, raw: Optional[str], always: Iterable[str] = ()) -> Optional[List[str]]:
+    """
+    Returns the attributes to read, or None for "whole item".
+
+    The model's hash key (plus anything in `always`, e.g. index keys needed
+    to build a pagination cursor) is always included. Unknown names raise
+    ValueError so controllers can answer with a 400.
+    """
+    if not raw:
+        return None
+    requested = [f.strip() for f in raw.split(",") if f.strip()]
+    if not requested:
+        return None
+    known = model.get_attributes()
+    unknown = [f for f in requested if f not in known]
+    if unknown:
+        raise ValueError("unknown fields: " + ", ".join(unknown))
+
+    fields = [model._hash_keyname, *always]
+    for f in requested:
+        if f not in fields:
+            fields.append(f)
+    return fields
+
+
+def project(item: dict, fields: Optional[List[str]]) -> dict:
+    """
+    Trims an already-loaded item down to `fields`. Also needed after a
+    projected read: PynamoDB fills attribute defaults (e.g. order_date)
+    for attributes DynamoDB did not return.
+    """
+    if fields is None:
+        return item
+    return {k: item[k] for k in fields if k in item}
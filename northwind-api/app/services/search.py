@@ -0,0 +1,257 @@
+"""
+In-memory inverted index for type-ahead search on product names.
+
+The index lives at module scope like the item caches, so a warm Lambda
+container builds it once (lazily, on the first search) from a parallel
+scan and then keeps it current through ProductService writes. Because
+other containers write too, it is rebuilt in full, on a background thread,
+once it is older than Config.SEARCH_REBUILD_SECONDS.
+
+Names are split into lowercase word tokens. Tokens are kept in a sorted
+list next to the postings map so a prefix lookup is a bisect plus a short
+walk, with no scan over the whole vocabulary.
+"""
+
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..config import Config
+
+logger = logging.getLogger("northwind-api")
+
+# the attributes we keep per product to render a search hit
+SEARCH_FIELDS = ["product_id", "product_name", "category", "unit_price"]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase, accent-folded word tokens of `text`."""
+    if not text:
+        return []
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).casefold()
+    return _TOKEN_RE.findall(folded)
+
+
+class _Postings:
+    """The index data itself: postings, sorted vocabulary and per-doc state."""
+
+    def __init__(self, text_field: str, id_field: str):
+        self.text_field = text_field
+        self.id_field = id_field
+        self.postings: Dict[str, Set[str]] = {}
+        self.vocabulary: List[str] = []
+        self.docs: Dict[str, Dict] = {}
+        self.doc_tokens: Dict[str, List[str]] = {}
+        self.doc_text: Dict[str, str] = {}
+
+    def add(self, doc: Dict, keep_sorted: bool = True) -> None:
+        doc_id = doc[self.id_field]
+        words = tokenize(doc.get(self.text_field))
+        tokens = sorted(set(words))
+        self.docs[doc_id] = doc
+        self.doc_tokens[doc_id] = tokens
+        self.doc_text[doc_id] = " ".join(words)
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                self.postings[token] = ids = set()
+                if keep_sorted:
+                    insort(self.vocabulary, token)
+                else:
+                    self.vocabulary.append(token)
+            ids.add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        self.docs.pop(doc_id, None)
+        self.doc_text.pop(doc_id, None)
+        for token in self.doc_tokens.pop(doc_id, ()):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(doc_id)
+            if not ids:
+                del self.postings[token]
+                idx = bisect_left(self.vocabulary, token)
+                if idx < len(self.vocabulary) and self.vocabulary[idx] == token:
+                    del self.vocabulary[idx]
+
+    def apply(self, op: str, value) -> None:
+        if op == "upsert":
+            self.remove(value[self.id_field])
+            self.add(value)
+        else:
+            self.remove(value)
+
+    def matches(self, term: str) -> Dict[str, int]:
+        """doc id -> score for one query term: 2 for a whole-word hit, 1 for a prefix hit."""
+        scores: Dict[str, int] = {}
+        vocabulary = self.vocabulary
+        idx = bisect_left(vocabulary, term)
+        while idx < len(vocabulary) and vocabulary[idx].startswith(term):
+            token = vocabulary[idx]
+            score = 2 if token == term else 1
+            for doc_id in self.postings[token]:
+                if scores.get(doc_id, 0) < score:
+                    scores[doc_id] = score
+            idx += 1
+        return scores
+
+
+class SearchIndex:
+    """
+    Searches are served from the current _Postings under a short lock.
+    Rebuilds load into a fresh _Postings without holding it, replay the
+    writes that arrived meanwhile and swap it in, so neither searches nor
+    ProductService writes wait on a table scan. Only the very first build
+    runs on the request path; later (periodic) rebuilds run on a
+    background thread while the old index keeps serving.
+    """
+
+    def __init__(self, name: str, text_field: str, id_field: str,
+                 loader: Callable[[], Iterable[Dict]], rebuild_seconds: float):
+        self.name = name
+        self.text_field = text_field
+        self.id_field = id_field
+        self.rebuild_seconds = rebuild_seconds
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._index = _Postings(text_field, id_field)
+        self._journal: Optional[List[Tuple[str, Any]]] = None
+        self._built_at: Optional[float] = None
+        self._refreshing = False
+
+    @property
+    def built(self) -> bool:
+        return self._built_at is not None
+
+    def _stale(self) -> bool:
+        return (self._built_at is not None and self.rebuild_seconds > 0
+                and time.monotonic() - self._built_at > self.rebuild_seconds)
+
+    def ensure_built(self) -> None:
+        """Builds the index on first use; schedules a background rebuild once it is stale."""
+        if self._built_at is None:
+            with self._build_lock:
+                if self._built_at is None:
+                    self._rebuild_locked(None)
+        elif self._stale():
+            with self._lock:
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            threading.Thread(target=self._refresh, name=f"{self.name}-search-rebuild",
+                             daemon=True).start()
+
+    def _refresh(self) -> None:
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Rebuilding the %s search index failed", self.name)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def rebuild(self, docs: Optional[Iterable[Dict]] = None) -> None:
+        """Replaces the whole index with `docs` (default: everything the loader yields)."""
+        with self._build_lock:
+            self._rebuild_locked(docs)
+
+    def _rebuild_locked(self, docs: Optional[Iterable[Dict]]) -> None:
+        with self._lock:
+            self._journal = []
+        try:
+            fresh = _Postings(self.text_field, self.id_field)
+            for doc in (self._loader() if docs is None else docs):
+                fresh.add(doc, keep_sorted=False)
+            fresh.vocabulary.sort()
+            with self._lock:
+                # writes that raced with the load win over what it read
+                for op, value in self._journal:
+                    fresh.apply(op, value)
+                self._index = fresh
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._journal = None
+
+    def upsert(self, doc: Dict) -> None:
+        """
+        Re-indexes one document after a write. Until the first search builds
+        the index there is nothing to keep current, so this is a no-op then
+        (unless that first build is in progress).
+        """
+        self._write("upsert", doc)
+
+    def remove(self, doc_id: str) -> None:
+        self._write("remove", doc_id)
+
+    def _write(self, op: str, value) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((op, value))
+            if self._built_at is not None:
+                self._index.apply(op, value)
+
+    def search(self, query: str, limit: int) -> List[Dict]:
+        """
+        Documents whose text contains every query term as a word or word
+        prefix, best first: more whole-word hits, then names starting with
+        the query, then shorter names.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        self.ensure_built()
+        with self._lock:
+            index = self._index
+            totals: Optional[Dict[str, int]] = None
+            # rarest-looking (longest) term first keeps the candidate set small
+            for term in sorted(set(terms), key=len, reverse=True):
+                scores = index.matches(term)
+                if totals is None:
+                    totals = scores
+                else:
+                    totals = {d: s + scores[d] for d, s in totals.items() if d in scores}
+                if not totals:
+                    return []
+
+            phrase = " ".join(terms)
+            text = index.doc_text
+
+            def rank(entry):
+                doc_id, score = entry
+                name = text[doc_id]
+                return (-score, not name.startswith(phrase), len(name), name, doc_id)
+
+            best = heapq.nsmallest(limit, totals.items(), key=rank)
+            return [dict(index.docs[doc_id]) for doc_id, _ in best]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            age = None if self._built_at is None else round(time.monotonic() - self._built_at, 3)
+            return {"documents": len(self._index.docs), "tokens": len(self._index.vocabulary),
+                    "age_seconds": age, "rebuild_seconds": self.rebuild_seconds,
+                    "rebuilding": self._refreshing}
+
+
+def _load_products() -> Iterable[Dict]:
+    from .product_service import ProductService
+    return ProductService.iter_all(SEARCH_FIELDS)
+
+
+product_index = SearchIndex("products", "product_name", "product_id",
+                            _load_products, Config.SEARCH_REBUILD_SECONDS)
+
+
+def search_doc(item: Dict) -> Dict:
+    """The slice of a product item the search index keeps."""
+    return {k: item[k] for k in SEARCH_FIELDS if item.get(k) is not None}
@@ -0,0 +1,131 @@
+"""
+Write sharding for secondary indexes with hot partition keys.
+
+A GSI keyed on a low-cardinality value (a country, a day) funnels all of
+its writes into one partition. Instead the index hash key is written as
+``<value>#<shard>``, with the shard derived from the item's own key, and
+readers query every shard of a value concurrently and merge the results
+on the index sort key.
+
+A merged page takes the first `limit` items across all shards. Its cursor
+is a map of shard -> the index key of the last item consumed from that
+shard (null once a shard is drained). Items a shard returned beyond that
+point are simply read again on the next page.
+"""
+
+import contextvars
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .pagination import encode_token
+from .projection import project
+
+# cursor slot of a shard that has no more items
+_DRAINED = None
+
+
+def shard_for(key: str, shards: int) -> int:
+    """Stable shard number for `key` (crc32, so it is the same in every process)."""
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+def sharded_key(value: str, shard: int) -> str:
+    return f"{value}#{shard}"
+
+
+def _index_key_names(model, index) -> List[str]:
+    names = [model._hash_keyname]
+    if model._range_keyname:
+        names.append(model._range_keyname)
+    for name, attr in index.Meta.attributes.items():
+        if (attr.is_hash_key or attr.is_range_key) and name not in names:
+            names.append(name)
+    return names
+
+
+def _cursor_key(model, key_names: Sequence[str], item: Dict) -> Dict[str, Any]:
+    """The LastEvaluatedKey DynamoDB would have returned right after `item`."""
+    attributes = model.get_attributes()
+    return {name: {attributes[name].attr_type: attributes[name].serialize(item[name])}
+            for name in key_names}
+
+
+def _parse_cursor(cursor: Optional[Dict], shards: Sequence[str]) -> Dict[str, Optional[Dict]]:
+    if cursor is None:
+        return {s: {} for s in shards}
+    state = cursor.get("shards")
+    if not isinstance(state, dict) or set(state) != set(shards):
+        raise ValueError("invalid next_token")
+    return {s: state[s] if state[s] is not None else _DRAINED for s in shards}
+
+
+def query_shards_page(model, index, hash_keys: Sequence[str], limit: int,
+                      cursor: Optional[Dict] = None, range_key_condition=None,
+                      attributes_to_get: Optional[List[str]] = None,
+                      scan_index_forward: bool = True,
+                      sort_key: Optional[Callable[[Dict], Any]] = None) -> Dict[str, Any]:
+    """
+    Queries `index` once per hash key in parallel and merges the results
+    into one page of at most `limit` items: {"items", "next_token"}.
+
+    `cursor` is a decoded next_token from a previous page. `sort_key` orders
+    the merged items and must agree with the index sort order (default: the
+    index range key).
+    """
+    key_names = _index_key_names(model, index)
+    range_name = next(n for n, a in index.Meta.attributes.items() if a.is_range_key)
+    if sort_key is None:
+        sort_key = lambda item: item.get(range_name)
+    fields = None
+    if attributes_to_get is not None:
+        fields = list(attributes_to_get) + [k for k in key_names if k not in attributes_to_get]
+    state = _parse_cursor(cursor, hash_keys)
+
+    def fetch(hash_key):
+        start = state[hash_key]
+        if start is _DRAINED:
+            return hash_key, [], False
+        results = index.query(hash_key, range_key_condition=range_key_condition,
+                              scan_index_forward=scan_index_forward, limit=limit,
+                              last_evaluated_key=start or None, attributes_to_get=fields)
+        items = [r.attribute_values for r in results]
+        return hash_key, items, results.last_evaluated_key is not None
+
+    with ThreadPoolExecutor(max_workers=len(hash_keys), thread_name_prefix="shard") as pool:
+        # copy the caller's context so request metrics follow the fan-out
+        futures = [pool.submit(contextvars.copy_context().run, fetch, h) for h in hash_keys]
+        fetched = [f.result() for f in futures]
+
+    merged = [(item, hash_key) for hash_key, items, _ in fetched for item in items]
+    merged.sort(key=lambda entry: sort_key(entry[0]), reverse=not scan_index_forward)
+    page = merged[:limit]
+
+    next_state: Dict[str, Optional[Dict]] = {}
+    for hash_key, items, has_more in fetched:
+        consumed = [item for item, h in page if h == hash_key]
+        if state[hash_key] is _DRAINED or (not has_more and len(consumed) == len(items)):
+            next_state[hash_key] = _DRAINED
+        elif consumed:
+            next_state[hash_key] = _cursor_key(model, key_names, consumed[-1])
+        else:
+            next_state[hash_key] = state[hash_key]
+
+    done = all(v is _DRAINED for v in next_state.values())
+    items = [project(item, attributes_to_get) for item, _ in page]
+    return {"items": items, "next_token": None if done else encode_token({"shards": next_state})}
+
+
+def iter_shards(model, index, hash_keys: Sequence[str], page_size: int,
+                range_key_condition=None, attributes_to_get: Optional[List[str]] = None,
+                scan_index_forward: bool = True) -> Iterator[Dict]:
+    """
+    Every item of a sharded query, one shard after another. Unlike
+    query_shards_page() nothing is merged, so each item is read exactly
+    once; callers that stream (NDJSON) do not need a global order.
+    """
+    for hash_key in hash_keys:
+        for r in index.query(hash_key, range_key_condition=range_key_condition,
+                             scan_index_forward=scan_index_forward, page_size=page_size,
+                             attributes_to_get=attributes_to_get):
+            yield project(r.attribute_values, attributes_to_get)
@@ -0,0 +1,43 @@
+"""
+Partial updates as a single conditional UpdateItem.
+
+Instead of GetItem + full PutItem, the validated PATCH payload becomes one
+UpdateItem call with SET/REMOVE actions for only the fields that changed,
+guarded by an attribute_exists() condition on the hash key so a missing
+item still surfaces as "not found". DynamoDB answers with ALL_NEW, which
+PynamoDB loads back into the returned instance.
+"""
+
+from typing import Any, Dict
+
+from pynamodb.exceptions import UpdateError
+
+
+def update_item(model, hash_key: str, patch: Dict[str, Any]):
+    """
+    Applies `patch` to the item `hash_key` and returns the updated instance,
+    or None if the item does not exist. The hash key itself is never rewritten.
+    """
+    key_name = model._hash_keyname
+    key_attr = getattr(model, key_name)
+    actions = []
+    for name, value in patch.items():
+        if name == key_name:
+            continue
+        attr = getattr(model, name)
+        actions.append(attr.remove() if value is None else attr.set(value))
+
+    if not actions:
+        try:
+            return model.get(hash_key)
+        except model.DoesNotExist:
+            return None
+
+    item = model(hash_key)
+    try:
+        item.update(actions=actions, condition=key_attr.exists())
+    except UpdateError as e:
+        if e.cause_response_code == "ConditionalCheckFailedException":
+            return None
+        raise
+    return item
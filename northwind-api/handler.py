@@ -1,7 +1,9 @@
 from aws_lambda_wsgi import response
 from app import create_app
+from app.compression import compress_response, decode_request_body
 
 app = create_app()
 
 def lambda_handler(event, context):
-    return response(app, event, context)
+    event = decode_request_body(event)
+    return compress_response(event, response(app, event, context))
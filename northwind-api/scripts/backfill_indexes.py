@@ -0,0 +1,73 @@
+# scripts/backfill_indexes.py
+"""
+Backfills the derived secondary-index attributes on items written before
+those indexes existed (or before a shard count changed):
+
+    customers  country_shard / city_key      (countryShard-index)
+    orders     pending_shard / pending_key   (pendingShipment-index)
+               order_day                     (orderDay-index)
+
+Items are read with a parallel scan and only those whose stored keys
+differ from what the service would write now get one conditional
+UpdateItem each:
+
+    PYTHONPATH=. python scripts/backfill_indexes.py [--dry-run] [--only customers]
+"""
+import argparse
+import sys
+
+from app.models.customer import CustomerModel
+from app.models.order import OrderModel
+from app.services.customer_service import index_keys
+from app.services.order_service import order_day, pending_keys
+from app.services.parallel_scan import parallel_scan
+from app.services.updates import update_item
+
+
+def customer_keys(c):
+    return index_keys(c.customer_id, c.country, c.city)
+
+
+def order_keys(o):
+    return {**pending_keys(o.order_id, o.ship_via, o.order_date, o.shipped_date),
+            "order_day": order_day(o.order_date)}
+
+
+# name -> (model, attributes the key function reads plus the stored keys, key function)
+TARGETS = {
+    "customers": (CustomerModel, ["customer_id", "country", "city", "country_shard", "city_key"],
+                  customer_keys),
+    "orders": (OrderModel, ["order_id", "ship_via", "order_date", "shipped_date",
+                            "pending_shard", "pending_key", "order_day"], order_keys),
+}
+
+
+def backfill(name, dry_run=False):
+    model, attributes, keys_for = TARGETS[name]
+    hash_key = model._hash_keyname
+    scanned = changed = 0
+    for item in parallel_scan(model, attributes_to_get=attributes):
+        scanned += 1
+        keys = keys_for(item)
+        if all(getattr(item, k) == v for k, v in keys.items()):
+            continue
+        changed += 1
+        if not dry_run:
+            update_item(model, getattr(item, hash_key), keys)
+    return {"scanned": scanned, "updated": changed}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Backfill derived index attributes")
+    p.add_argument("--only", choices=sorted(TARGETS), action="append")
+    p.add_argument("--dry-run", action="store_true", help="count, but do not write")
+    args = p.parse_args(argv)
+    for name in args.only or sorted(TARGETS):
+        result = backfill(name, args.dry_run)
+        verb = "would update" if args.dry_run else "updated"
+        print(f"{name}: scanned {result['scanned']}, {verb} {result['updated']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# scripts/bench_json.py
+"""
+Compares the old order serialization path (recursive serialize() followed
+by Flask's default JSON provider) with FastJSONProvider on a 1,000-order
+customer history. Runs in memory, no DynamoDB needed:
+
+    python scripts/bench_json.py [orders] [items_per_order]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import FastJSONProvider, orjson
+from app.models.order import OrderItem, OrderModel
+
+
+def legacy_serialize(obj):
+    if hasattr(obj, "attribute_values"):
+        return legacy_serialize(obj.attribute_values)
+    if isinstance(obj, dict):
+        return {k: legacy_serialize(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [legacy_serialize(v) for v in obj]
+    return obj
+
+
+def make_history(n_orders, n_items):
+    start = datetime(2024, 1, 1)
+    return [
+        OrderModel(
+            order_id=f"O{n:05d}",
+            customer_id="C001",
+            order_date=start + timedelta(hours=n),
+            ship_via="Air",
+            items=[OrderItem(product_id=f"P{i:03d}", quantity=i + 1, unit_price=9.99)
+                   for i in range(n_items)],
+        ).attribute_values
+        for n in range(n_orders)
+    ]
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_items = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    history = make_history(n_orders, n_items)
+    app = Flask(__name__)
+    default, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+
+    runs = 20
+    old = min(timeit.repeat(lambda: default.dumps([legacy_serialize(o) for o in history]),
+                            number=1, repeat=runs))
+    new = min(timeit.repeat(lambda: fast.dumpb(history), number=1, repeat=runs))
+
+    print(f"{n_orders} orders x {n_items} items "
+          f"(encoder: {'orjson' if orjson else 'stdlib json'})")
+    print(f"  serialize() + default provider: {old * 1000:8.2f} ms")
+    print(f"  FastJSONProvider:               {new * 1000:8.2f} ms")
+    print(f"  speedup:                        {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
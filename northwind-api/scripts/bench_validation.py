@@ -0,0 +1,42 @@
+# scripts/bench_validation.py
+"""
+Micro-benchmark: marshmallow OrderSchema.load vs the compiled fast path
+for a 1-item and a 500-item order. Runs in memory:
+
+    python scripts/bench_validation.py
+"""
+import timeit
+
+from app.schemas.compiled import compile_schema
+from app.schemas.order_schema import OrderSchema
+
+
+def make_order(n_items):
+    return {
+        "order_id": "O00001",
+        "customer_id": "C001",
+        "order_date": "2025-03-01T10:00:00",
+        "ship_via": "Air",
+        "items": [{"product_id": f"P{i:03d}", "quantity": i % 9 + 1, "unit_price": 9.99}
+                  for i in range(n_items)],
+    }
+
+
+def bench(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    schema = OrderSchema()
+    compiled = compile_schema(OrderSchema())
+    for n_items, number in ((1, 2000), (500, 20)):
+        order = make_order(n_items)
+        assert compiled.load(order) == schema.load(order)
+        slow = bench(lambda: schema.load(order), number)
+        fast = bench(lambda: compiled.load(order), number)
+        print(f"{n_items:>4} item(s): marshmallow {slow * 1e6:9.1f} us   "
+              f"compiled {fast * 1e6:9.1f} us   speedup {slow / fast:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# scripts/import_budget.py
+"""
+Reports where handler import (i.e. Lambda cold start init) time goes.
+
+Runs ``python -X importtime -c "import handler"`` in a fresh interpreter
+and prints the slowest modules by cumulative import time:
+
+    python scripts/import_budget.py [--top 20] [--budget-ms 800] [--module handler]
+
+Exits with status 1 when the total exceeds --budget-ms.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module="handler"):
+    """Returns [(module, self_us, cumulative_us)] from -X importtime, in import order."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def total_ms(rows, module="handler"):
+    for name, _, cumulative in reversed(rows):
+        if name == module:
+            return cumulative / 1000
+    raise LookupError(f"{module} not found in importtime output")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="handler")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    rows = import_times(args.module)
+    total = total_ms(rows, args.module)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+    print(f"\nimport {args.module}: {total:.1f} ms")
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"over budget ({args.budget_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# scripts/load_test.py
+"""
+Reproducible load test / throughput benchmark for every API route.
+
+Starts moto in server mode (or uses --dynamodb-endpoint, e.g. DynamoDB
+Local), creates the tables, seeds a deterministic data set, serves the
+Flask app on a local threaded server and drives each route at a fixed
+concurrency. Results (requests/sec, latency percentiles, error counts)
+are written to a JSON file:
+
+    python scripts/load_test.py --customers 200 --products 500 --orders 2000 \\
+        --requests 300 --concurrency 8 --output load_results.json
+
+With --baseline, routes whose throughput dropped by more than
+--max-regression (fraction) against a previous results file make the
+script exit with status 1.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Northwind API load test")
+    p.add_argument("--customers", type=int, default=200)
+    p.add_argument("--products", type=int, default=500)
+    p.add_argument("--orders", type=int, default=2000)
+    p.add_argument("--items-per-order", type=int, default=5)
+    p.add_argument("--requests", type=int, default=200, help="requests per route")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--dynamodb-endpoint", default=None,
+                   help="use this endpoint instead of starting a moto server")
+    p.add_argument("--output", default="load_results.json")
+    p.add_argument("--baseline", default=None, help="previous results file to compare against")
+    p.add_argument("--max-regression", type=float, default=0.2)
+    return p.parse_args(argv)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+# ---------------------------------------------------------------- data set
+
+def generate_data(args):
+    """Deterministic customers, products and orders for a given --seed."""
+    rnd = random.Random(args.seed)
+    countries = ["Germany", "France", "UK", "USA", "Brazil", "Japan"]
+    categories = ["Beverages", "Condiments", "Dairy", "Grains", "Produce", "Seafood"]
+    customers = [{"customer_id": f"C{i:06d}", "company_name": f"Company {i}",
+                  "contact_name": f"Contact {i}", "country": rnd.choice(countries),
+                  "city": f"City {rnd.randint(1, 50)}"}
+                 for i in range(args.customers)]
+    products = [{"product_id": f"P{i:06d}", "product_name": f"Product {i}",
+                 "category": rnd.choice(categories),
+                 "unit_price": round(rnd.uniform(1, 100), 2),
+                 "units_in_stock": rnd.randint(0, 500)}
+                for i in range(args.products)]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    orders = [{"order_id": f"O{i:07d}",
+               "customer_id": rnd.choice(customers)["customer_id"],
+               "order_date": start + timedelta(minutes=rnd.randint(0, 525600)),
+               "ship_via": rnd.choice(["Air", "Sea", "Road"]),
+               "items": [{"product_id": p["product_id"], "quantity": rnd.randint(1, 10),
+                          "unit_price": p["unit_price"]}
+                         for p in rnd.sample(products, min(args.items_per_order, len(products)))]}
+              for i in range(args.orders)]
+    return customers, products, orders
+
+
+def seed(customers, products, orders):
+    from app.services.customer_service import CustomerService
+    from app.services.order_service import OrderService
+    from app.services.product_service import ProductService
+
+    chunk = 500
+    for service, rows in ((CustomerService, customers), (ProductService, products),
+                          (OrderService, orders)):
+        for i in range(0, len(rows), chunk):
+            service.bulk_create(rows[i:i + chunk])
+
+
+# ---------------------------------------------------------------- scenarios
+
+def scenarios(customers, products, orders, rnd):
+    """(name, method, path factory, body factory) for every blueprint route."""
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    def nxt():
+        with lock:
+            return next(counter)
+
+    cid = lambda: rnd.choice(customers)["customer_id"]
+    pid = lambda: rnd.choice(products)["product_id"]
+    oid = lambda: rnd.choice(orders)["order_id"]
+
+    def new_order(n):
+        return {"order_id": f"LT-O{n}", "customer_id": cid(),
+                "items": [{"product_id": pid(), "quantity": 1, "unit_price": 5.0}]}
+
+    return [
+        ("GET /", "GET", lambda: "/", None),
+        ("POST /customers/", "POST", lambda: "/customers/",
+         lambda: {"customer_id": f"LT-C{nxt()}", "company_name": "Load Co"}),
+        ("POST /customers/bulk", "POST", lambda: "/customers/bulk",
+         lambda: [{"customer_id": f"LT-CB{nxt()}", "company_name": "Bulk Co"} for _ in range(25)]),
+        ("GET /customers/<id>", "GET", lambda: f"/customers/{cid()}", None),
+        ("POST /customers/batch-get", "POST", lambda: "/customers/batch-get",
+         lambda: {"ids": [cid() for _ in range(50)]}),
+        ("PATCH /customers/<id>", "PATCH", lambda: f"/customers/{cid()}",
+         lambda: {"phone": str(nxt())}),
+        ("GET /customers/", "GET", lambda: "/customers/?limit=100", None),
+        ("GET /customers/?country", "GET", lambda: "/customers/?country=Germany&limit=50", None),
+        ("GET /products/search", "GET",
+         lambda: f"/products/search?q=product+{rnd.randint(1, 99)}", None),
+        ("POST /products/", "POST", lambda: "/products/",
+         lambda: {"product_id": f"LT-P{nxt()}", "product_name": "Load product"}),
+        ("POST /products/bulk", "POST", lambda: "/products/bulk",
+         lambda: [{"product_id": f"LT-PB{nxt()}", "product_name": "Bulk product"} for _ in range(25)]),
+        ("GET /products/<id>", "GET", lambda: f"/products/{pid()}", None),
+        ("POST /products/batch-get", "POST", lambda: "/products/batch-get",
+         lambda: {"ids": [pid() for _ in range(50)]}),
+        ("PATCH /products/<id>", "PATCH", lambda: f"/products/{pid()}",
+         lambda: {"units_in_stock": nxt() % 500}),
+        ("GET /products/", "GET", lambda: "/products/?limit=100", None),
+        ("GET /products/?category", "GET",
+         lambda: "/products/?category=Beverages&min_price=10&max_price=60&limit=50", None),
+        ("POST /orders/", "POST", lambda: "/orders/", lambda: new_order(nxt())),
+        ("POST /orders/bulk", "POST", lambda: "/orders/bulk",
+         lambda: [new_order(f"B{nxt()}") for _ in range(25)]),
+        ("GET /orders/?from&to", "GET",
+         lambda: f"/orders/?from=2024-{rnd.randint(1, 12):02d}-01&to=2024-12-31&limit=100", None),
+        ("GET /orders/pending", "GET", lambda: "/orders/pending?ship_via=Sea&limit=50", None),
+        ("GET /orders/<id>", "GET", lambda: f"/orders/{oid()}", None),
+        ("PATCH /orders/<id>", "PATCH", lambda: f"/orders/{oid()}", lambda: {"ship_via": "Air"}),
+        ("GET /orders/customer/<id>/history", "GET",
+         lambda: f"/orders/customer/{cid()}/history?limit=50", None),
+        ("GET /orders/customer/<id>/history?expand", "GET",
+         lambda: f"/orders/customer/{cid()}/history?limit=20&expand=products", None),
+    ]
+
+
+def _request(base_url, method, path, body):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"} if data else {})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = 0
+    return (time.perf_counter() - started) * 1000, status
+
+
+def run_route(base_url, method, path_fn, body_fn, n_requests, concurrency):
+    jobs = [(path_fn(), body_fn() if body_fn else None) for _ in range(n_requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda j: _request(base_url, method, *j), jobs))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(r[0] for r in results)
+    errors = sum(1 for r in results if not 200 <= r[1] < 400)
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "requests_per_sec": round(n_requests / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+def compare(results, baseline, max_regression):
+    regressions = []
+    for name, r in results["routes"].items():
+        old = baseline.get("routes", {}).get(name)
+        if old and old["requests_per_sec"] > 0:
+            drop = 1 - r["requests_per_sec"] / old["requests_per_sec"]
+            if drop > max_regression:
+                regressions.append((name, old["requests_per_sec"], r["requests_per_sec"], drop))
+    return regressions
+
+
+# ---------------------------------------------------------------- main
+
+def main(argv=None):
+    args = parse_args(argv)
+    moto_server = None
+    endpoint = args.dynamodb_endpoint
+    if endpoint is None:
+        from moto.server import ThreadedMotoServer
+        port = _free_port()
+        moto_server = ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+        moto_server.start()
+        endpoint = f"http://127.0.0.1:{port}"
+
+    # must be in place before the app's models are imported
+    os.environ["DYNAMODB_ENDPOINT"] = endpoint
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    os.environ.setdefault("AWS_REGION", "us-east-1")
+    os.environ.setdefault("METRICS_MODE", "off")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    for table in ("CUSTOMERS", "PRODUCTS", "ORDERS"):
+        os.environ.setdefault(f"{table}_TABLE", f"loadtest-{table.title()}")
+    sys.path.insert(0, PROJECT_ROOT)
+
+    from werkzeug.serving import make_server
+    from app import create_app
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    from app.models.customer import CustomerModel
+    from app.models.order import OrderModel
+    from app.models.product import ProductModel
+
+    for model in (CustomerModel, ProductModel, OrderModel):
+        if not model.exists():
+            model.create_table(billing_mode="PAY_PER_REQUEST", wait=True)
+
+    customers, products, orders = generate_data(args)
+    t0 = time.perf_counter()
+    seed(customers, products, orders)
+    seed_secs = time.perf_counter() - t0
+
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    rnd = random.Random(args.seed)
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "dynamodb": "moto" if moto_server else endpoint},
+        "seed_seconds": round(seed_secs, 3),
+        "routes": {},
+    }
+    try:
+        for name, method, path_fn, body_fn in scenarios(customers, products, orders, rnd):
+            results["routes"][name] = run_route(base_url, method, path_fn, body_fn,
+                                                args.requests, args.concurrency)
+            r = results["routes"][name]
+            print(f"{name:<45} {r['requests_per_sec']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f}  "
+                  f"p95 {r['p95_ms']:>8.2f}  p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}")
+    finally:
+        server.shutdown()
+        if moto_server:
+            moto_server.stop()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for name, old, new, drop in regressions:
+            print(f"REGRESSION {name}: {old:.1f} -> {new:.1f} req/s ({drop:.0%} slower)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # scripts/seed.py
+from datetime import datetime
 from app.services.customer_service import CustomerService
 from app.services.product_service import ProductService
 from app.services.order_service import OrderService
@@ -12,5 +13,5 @@ ProductService.create({"product_id":"P001","product_name":"Widget","unit_price":
 ProductService.create({"product_id":"P002","product_name":"Gadget","unit_price":19.99,"units_in_stock":50})
 
 # orders
-OrderService.create({"order_id":"O001","customer_id":"C001","order_date":"2025-11-21","items":[{"product_id":"P001","quantity":2,"unit_price":9.99}]})
+OrderService.create({"order_id":"O001","customer_id":"C001","order_date":datetime(2025, 11, 21),"items":[{"product_id":"P001","quantity":2,"unit_price":9.99}]})
 print("Seed complete")
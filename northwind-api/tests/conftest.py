@@ -39,3 +39,11 @@ def dynamodb_server():
 
     
     mock.stop()
+
+
+@pytest.fixture
+def client():
+    from app import create_app
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
@@ -0,0 +1,89 @@
+from pynamodb.exceptions import PutError
+
+from app.config import Config
+from app.models.product import ProductModel
+from app.services import batch
+
+
+def test_bulk_write_retries_unprocessed_items(monkeypatch):
+    monkeypatch.setattr(Config, "BATCH_WRITE_BASE_DELAY", 0)
+    calls = []
+
+    class FlakyBatch:
+        """First commit leaves RT1 unprocessed, the retry succeeds."""
+        def __init__(self):
+            self.items, self.failed_operations = [], []
+
+        def save(self, item):
+            self.items.append(item)
+
+        def commit(self):
+            calls.append([i.product_id for i in self.items])
+            if len(calls) == 1:
+                self.failed_operations = [{"PutRequest": {"Item": {"product_id": {"S": "RT1"}}}}]
+                raise PutError("unprocessed")
+
+    monkeypatch.setattr(ProductModel, "batch_write", classmethod(lambda cls, auto_commit=True: FlakyBatch()))
+
+    items = [ProductModel(product_id=f"RT{i}", product_name="x") for i in range(3)]
+    results = batch.bulk_write(ProductModel, items)
+
+    assert calls == [["RT0", "RT1", "RT2"], ["RT1"]]
+    assert [r["status"] for r in results] == ["created"] * 3
+
+
+def test_bulk_write_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(Config, "BATCH_WRITE_BASE_DELAY", 0)
+    monkeypatch.setattr(Config, "BATCH_WRITE_MAX_RETRIES", 2)
+
+    class FailingBatch:
+        failed_operations = []
+
+        def save(self, item):
+            pass
+
+        def commit(self):
+            raise PutError("throttled")
+
+    monkeypatch.setattr(ProductModel, "batch_write", classmethod(lambda cls, auto_commit=True: FailingBatch()))
+
+    results = batch.bulk_write(ProductModel, [ProductModel(product_id="RTX", product_name="x")])
+    assert results[0]["status"] == "failed"
+
+
+def _throttle(monkeypatch, times):
+    """Makes the first `times` BatchGetItem pages leave every key unprocessed."""
+    real = ProductModel._batch_get_page.__func__
+    calls = []
+
+    def page(cls, keys, consistent_read, attributes_to_get):
+        calls.append(len(keys))
+        if len(calls) <= times:
+            # DynamoDB hands UnprocessedKeys back as typed attribute maps
+            return [], [{k: v if isinstance(v, dict) else {"S": v} for k, v in key.items()}
+                        for key in keys]
+        return real(cls, keys, consistent_read, attributes_to_get)
+
+    monkeypatch.setattr(ProductModel, "_batch_get_page", classmethod(page))
+    return calls
+
+
+def test_batch_get_backs_off_on_unprocessed_keys(monkeypatch):
+    monkeypatch.setattr(Config, "BATCH_WRITE_BASE_DELAY", 0)
+    ProductModel(product_id="BGR1", product_name="x").save()
+    calls = _throttle(monkeypatch, 2)
+
+    result = batch.batch_get(ProductModel, ["BGR1", "BGR-none"])
+    assert [p["product_id"] for p in result["items"]] == ["BGR1"]
+    assert result["missing"] == ["BGR-none"] and result["unprocessed"] == []
+    assert calls == [2, 2, 2]
+
+
+def test_batch_get_reports_keys_still_unprocessed_after_max_retries(monkeypatch):
+    monkeypatch.setattr(Config, "BATCH_WRITE_BASE_DELAY", 0)
+    monkeypatch.setattr(Config, "BATCH_WRITE_MAX_RETRIES", 2)
+    calls = _throttle(monkeypatch, 100)
+
+    result = batch.batch_get(ProductModel, ["BGR2", "BGR3"])
+    assert result == {"items": [], "missing": [], "unprocessed": ["BGR2", "BGR3"]}
+    assert len(calls) == 3
@@ -0,0 +1,22 @@
+import json
+import os
+import subprocess
+import sys
+
+from scripts.import_budget import PROJECT_ROOT, import_times, total_ms
+
+# generous by default so slow CI boxes don't flake; tighten per environment
+BUDGET_MS = float(os.getenv("HANDLER_IMPORT_BUDGET_MS", "1500"))
+
+
+def test_handler_import_defers_dynamodb_stack():
+    probe = ("import json, sys, handler; "
+             "print(json.dumps([m for m in sys.modules if m.split('.')[0] in ('pynamodb', 'botocore')]))")
+    out = subprocess.run([sys.executable, "-c", probe], cwd=PROJECT_ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    assert json.loads(out.splitlines()[-1]) == []
+
+
+def test_handler_import_time_within_budget():
+    total = total_ms(import_times("handler"))
+    assert total <= BUDGET_MS, f"handler import took {total:.0f} ms (budget {BUDGET_MS:.0f} ms)"
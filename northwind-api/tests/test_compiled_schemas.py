@@ -0,0 +1,52 @@
+import pytest
+from marshmallow import ValidationError
+
+from app.schemas.compiled import compile_schema
+from app.schemas.customer_schema import CustomerSchema
+from app.schemas.order_schema import OrderSchema
+from app.schemas.product_schema import ProductSchema
+
+ORDER = {"order_id": "O1", "customer_id": "C1", "ship_via": "Air",
+         "order_date": "2025-03-01T10:00:00", "shipped_date": None,
+         "items": [{"product_id": "P1", "quantity": 2, "unit_price": 3},
+                   {"product_id": "P2", "quantity": "4"}]}
+
+VALID = [
+    (OrderSchema, ORDER, {}),
+    (OrderSchema, {"ship_via": "Sea"}, {"partial": True}),
+    (ProductSchema, {"product_id": "P", "product_name": "n", "unit_price": 1.25, "units_in_stock": 3}, {}),
+    (ProductSchema, [{"product_id": "P", "product_name": "n"}] * 3, {"many": True}),
+    (CustomerSchema, {"customer_id": "C", "company_name": b"bytes"}, {}),
+]
+
+INVALID = [
+    (OrderSchema, dict(ORDER, items=[{"product_id": "P1", "quantity": 0}]), {}),
+    (OrderSchema, {"order_id": "O1"}, {}),
+    (OrderSchema, dict(ORDER, extra=1), {}),
+    (OrderSchema, {"items": "nope"}, {"partial": True}),
+    (ProductSchema, [{"product_id": "P", "product_name": "n"}, {"product_id": 5}], {"many": True}),
+    (ProductSchema, {"product_id": "P", "product_name": "n", "unit_price": float("nan")}, {}),
+    (CustomerSchema, ["not", "a", "dict"], {}),
+]
+
+
+@pytest.mark.parametrize("schema_cls,data,kwargs", VALID)
+def test_compiled_load_matches_marshmallow(schema_cls, data, kwargs):
+    compiled = compile_schema(schema_cls())
+    assert compiled._fast is not None
+    assert compiled.load(data, **kwargs) == schema_cls().load(data, **kwargs)
+
+
+@pytest.mark.parametrize("schema_cls,data,kwargs", INVALID)
+def test_compiled_errors_match_marshmallow(schema_cls, data, kwargs):
+    with pytest.raises(ValidationError) as expected:
+        schema_cls().load(data, **kwargs)
+    with pytest.raises(ValidationError) as got:
+        compile_schema(schema_cls()).load(data, **kwargs)
+    assert got.value.messages == expected.value.messages
+
+
+def test_fast_path_passes_partial_into_nested_lists():
+    data = {"items": [{"product_id": "P2"}]}
+    compiled = compile_schema(OrderSchema())
+    assert compiled._fast(data, True) == OrderSchema().load(data, partial=True)
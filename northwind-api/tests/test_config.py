@@ -0,0 +1,28 @@
+from app.config import Config
+from app.models.customer import CustomerModel
+from app.models.order import OrderModel
+from app.models.product import ProductModel
+
+
+def test_models_share_one_tuned_client():
+    clients = {id(m._get_connection().connection.client) for m in (CustomerModel, ProductModel, OrderModel)}
+    assert len(clients) == 1
+
+    client = CustomerModel._get_connection().connection.client
+    assert client is Config.dynamodb_client(CustomerModel.Meta.region, getattr(CustomerModel.Meta, "host", None))
+    assert client.meta.config.max_pool_connections == Config.DDB_MAX_POOL_CONNECTIONS
+    assert client.meta.config.tcp_keepalive == Config.DDB_TCP_KEEPALIVE
+    assert client.meta.config.retries["mode"] == Config.DDB_RETRY_MODE
+
+
+def test_client_without_credentials_is_rebuilt():
+    key = (CustomerModel.Meta.region, getattr(CustomerModel.Meta, "host", None))
+    poisoned = Config.dynamodb_client(*key)
+    signer_credentials = poisoned._request_signer._credentials
+    poisoned._request_signer._credentials = None
+    try:
+        fresh = Config.dynamodb_client(*key)
+        assert fresh is not poisoned
+        assert CustomerModel._get_connection().connection.client is fresh
+    finally:
+        poisoned._request_signer._credentials = signer_credentials
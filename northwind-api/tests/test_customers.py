@@ -12,3 +12,134 @@ def test_update_customer():
     CustomerService.create(payload)
     updated = CustomerService.update("T200", {"company_name":"New"})
     assert updated["company_name"] == "New"
+
+def test_get_is_served_from_cache_until_write():
+    from app.services.cache import customer_cache
+    CustomerService.create({"customer_id": "T300", "company_name": "Cached"})
+    CustomerService.get("T300")
+    hits = customer_cache.hits
+    assert CustomerService.get("T300")["company_name"] == "Cached"
+    assert customer_cache.hits == hits + 1
+
+    CustomerService.update("T300", {"company_name": "Fresh"})
+    assert CustomerService.get("T300")["company_name"] == "Fresh"
+
+def test_customer_stats_follow_order_writes(client):
+    from datetime import datetime
+    from app.services.order_service import OrderService
+    CustomerService.create({"customer_id": "T400", "company_name": "Stats"})
+
+    def order(order_id, day, qty):
+        return {"order_id": order_id, "customer_id": "T400", "order_date": datetime(2025, 5, day),
+                "items": [{"product_id": "P1", "quantity": qty, "unit_price": 10.0}]}
+
+    OrderService.create(order("ST1", 2, 1))
+    OrderService.bulk_create([order("ST2", 9, 2), order("ST3", 4, 1)])
+    OrderService.update("ST1", {"items": [{"product_id": "P1", "quantity": 3, "unit_price": 10.0}]})
+
+    assert "order_count" not in client.get("/customers/T400").get_json()
+    stats = client.get("/customers/T400?include=stats").get_json()
+    assert stats["order_count"] == 3
+    assert stats["total_spend"] == 60.0
+    assert stats["last_order_date"].startswith("2025-05-09T00:00:00")
+
+def test_overwriting_an_order_only_applies_the_difference(client):
+    from datetime import datetime
+    from app.services.order_service import OrderService
+    CustomerService.create({"customer_id": "T410", "company_name": "Once"})
+    CustomerService.create({"customer_id": "T411", "company_name": "Other"})
+    order = {"order_id": "OW1", "customer_id": "T410", "order_date": datetime(2025, 6, 1),
+             "items": [{"product_id": "P1", "quantity": 1, "unit_price": 10.0}]}
+
+    assert client.post("/orders/", json={**order, "order_date": "2025-06-01T00:00:00"}).status_code == 201
+    assert client.post("/orders/", json={**order, "order_date": "2025-06-01T00:00:00"}).status_code == 201
+    OrderService.bulk_create([order])
+    stats = client.get("/customers/T410?include=stats").get_json()
+    assert (stats["order_count"], stats["total_spend"]) == (1, 10.0)
+
+    OrderService.create({**order, "customer_id": "T411"})
+    moved = client.get("/customers/T410?include=stats").get_json()
+    assert (moved["order_count"], moved["total_spend"]) == (0, 0)
+    other = client.get("/customers/T411?include=stats").get_json()
+    assert (other["order_count"], other["total_spend"]) == (1, 10.0)
+
+def test_bulk_orders_with_mixed_timezones_update_stats(client):
+    from datetime import datetime, timedelta, timezone
+    from app.services.order_service import OrderService
+    CustomerService.create({"customer_id": "T415", "company_name": "Zones"})
+    items = [{"product_id": "P1", "quantity": 1, "unit_price": 10.0}]
+    plus_two = timezone(timedelta(hours=2))
+
+    results = OrderService.bulk_create([
+        {"order_id": "TZ1", "customer_id": "T415", "order_date": datetime(2025, 8, 1, 12), "items": items},
+        {"order_id": "TZ2", "customer_id": "T415", "order_date": datetime(2025, 8, 1, 13, tzinfo=plus_two),
+         "items": items},
+    ])
+    assert all(r["status"] == "created" for r in results)
+    stats = client.get("/customers/T415?include=stats").get_json()
+    assert stats["order_count"] == 2
+    assert stats["last_order_date"].startswith("2025-08-01T12:00:00")
+
+def test_reimporting_a_customer_keeps_its_stats(client):
+    from datetime import datetime
+    from app.services.order_service import OrderService
+    CustomerService.create({"customer_id": "T420", "company_name": "Before", "phone": "123"})
+    OrderService.create({"order_id": "RI1", "customer_id": "T420", "order_date": datetime(2025, 7, 1),
+                         "items": [{"product_id": "P1", "quantity": 2, "unit_price": 10.0}]})
+
+    assert client.post("/customers/", json={"customer_id": "T420", "company_name": "Again"}).status_code == 201
+    resp = client.post("/customers/bulk", json=[{"customer_id": "T420", "company_name": "After"},
+                                                 {"customer_id": "T421", "company_name": "New"}])
+    assert resp.status_code == 201 and resp.get_json()["created"] == 2
+
+    stats = client.get("/customers/T420?include=stats").get_json()
+    assert stats["company_name"] == "After" and "phone" not in stats
+    assert (stats["order_count"], stats["total_spend"]) == (1, 20.0)
+    assert stats["last_order_date"].startswith("2025-07-01")
+
+def test_customers_by_country_merges_all_shards(client):
+    cities = ["Berlin", "Aachen", "Munich", "Berlin", "Cologne", "Aachen", "Berlin"]
+    for i, city in enumerate(cities):
+        CustomerService.create({"customer_id": f"DE{i}", "company_name": f"Kunde {i}",
+                                "country": "Germany", "city": city})
+    CustomerService.create({"customer_id": "FR1", "company_name": "Client", "country": "France",
+                            "city": "Berlin"})
+
+    seen, token = [], None
+    while True:
+        url = "/customers/?country=Germany&limit=3" + (f"&next_token={token}" if token else "")
+        body = client.get(url).get_json()
+        assert len(body["items"]) <= 3
+        seen.extend(body["items"])
+        token = body["next_token"]
+        if not token:
+            break
+    assert [c["city"] for c in seen] == sorted(cities)
+    assert sorted(c["customer_id"] for c in seen) == [f"DE{i}" for i in range(7)]
+    assert "country_shard" not in seen[0] and "city_key" not in seen[0]
+
+    berlin = client.get("/customers/?country=Germany&city=Berlin").get_json()["items"]
+    assert [c["customer_id"] for c in berlin] == ["DE0", "DE3", "DE6"]
+
+def test_moving_a_customer_updates_the_country_index(client):
+    CustomerService.create({"customer_id": "MV1", "company_name": "Mover", "country": "Spain",
+                            "city": "Madrid"})
+    CustomerService.update("MV1", {"city": "Sevilla"})
+    rows = client.get("/customers/?country=Spain&city=Sevilla").get_json()["items"]
+    assert [c["customer_id"] for c in rows] == ["MV1"]
+
+    CustomerService.update("MV1", {"country": None})
+    assert client.get("/customers/?country=Spain").get_json()["items"] == []
+    assert client.get("/customers/?city=Sevilla").status_code == 400
+
+def test_backfill_adds_country_keys_to_existing_customers(client):
+    from app.models.customer import CustomerModel
+    from scripts.backfill_indexes import backfill
+    CustomerModel(customer_id="BF1", company_name="Legacy", country="Norway", city="Oslo").save()
+    assert client.get("/customers/?country=Norway").get_json()["items"] == []
+
+    assert backfill("customers", dry_run=True)["updated"] >= 1
+    backfill("customers")
+    rows = client.get("/customers/?country=Norway&city=Oslo").get_json()["items"]
+    assert [c["customer_id"] for c in rows] == ["BF1"]
+    assert backfill("customers")["updated"] == 0
@@ -0,0 +1,57 @@
+import base64
+import gzip
+import json
+
+from app.config import Config
+
+
+def _event(path, headers=None, method="GET", body=None):
+    # API Gateway always forwards Host and X-Forwarded-Proto
+    base = {"Host": "api.example.com", "X-Forwarded-Proto": "https", "X-Forwarded-Port": "443"}
+    return {"httpMethod": method, "path": path, "queryStringParameters": None,
+            "headers": dict(base, **(headers or {})), "body": body}
+
+
+def test_large_bodies_are_gzipped_when_accepted(monkeypatch):
+    from handler import lambda_handler
+    monkeypatch.setattr(Config, "COMPRESSION_MIN_BYTES", 10)
+
+    result = lambda_handler(_event("/", {"Accept-Encoding": "gzip, deflate"}), None)
+    assert result["isBase64Encoded"] is True
+    assert result["headers"]["Content-Encoding"] == "gzip"
+    body = gzip.decompress(base64.b64decode(result["body"]))
+    assert json.loads(body)["service"] == "northwind-api"
+
+
+def test_compressed_bodies_get_a_weak_etag_that_still_revalidates(monkeypatch):
+    from handler import lambda_handler
+    monkeypatch.setattr(Config, "COMPRESSION_MIN_BYTES", 10)
+    plain = lambda_handler(_event("/customers/"), None)
+    assert not plain["headers"]["ETag"].startswith("W/")
+
+    result = lambda_handler(_event("/customers/", {"Accept-Encoding": "gzip"}), None)
+    etag = result["headers"]["ETag"]
+    assert etag == "W/" + plain["headers"]["ETag"]
+
+    again = lambda_handler(_event("/customers/", {"Accept-Encoding": "gzip", "If-None-Match": etag}), None)
+    assert again["statusCode"] == 304
+
+
+def test_small_or_unaccepted_bodies_are_left_alone(monkeypatch):
+    from handler import lambda_handler
+    plain = lambda_handler(_event("/", {"Accept-Encoding": "gzip"}), None)
+    assert plain["isBase64Encoded"] is False
+
+    monkeypatch.setattr(Config, "COMPRESSION_MIN_BYTES", 10)
+    identity = lambda_handler(_event("/", {"Accept-Encoding": "identity"}), None)
+    assert identity["isBase64Encoded"] is False
+    assert json.loads(identity["body"])["ok"] is True
+
+
+def test_base64_request_bodies_are_decoded():
+    from handler import lambda_handler
+    payload = json.dumps({"customer_id": "H100", "company_name": "Encoded"})
+    event = _event("/customers/", {"Content-Type": "application/json"}, "POST",
+                   base64.b64encode(payload.encode()).decode())
+    event["isBase64Encoded"] = True
+    assert lambda_handler(event, None)["statusCode"] == 201
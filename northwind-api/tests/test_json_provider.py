@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from app import json_provider
+from app.json_provider import FastJSONProvider
+from app.models.order import OrderItem
+
+DOC = {"b": Decimal("1.5"), "a": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+       "items": [OrderItem(product_id="P1", quantity=2)], "errors": {1: "y", 0: "x"}}
+EXPECTED = ('{"a":"2025-01-02T03:04:05+00:00","b":1.5,"errors":{"0":"x","1":"y"},'
+            '"items":[{"product_id":"P1","quantity":2}]}')
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_provider_handles_model_types(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson not installed")
+    provider = FastJSONProvider(Flask(__name__))
+    assert provider.dumps(DOC) == EXPECTED
+    assert provider.loads(EXPECTED)["b"] == 1.5
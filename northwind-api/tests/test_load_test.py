@@ -0,0 +1,23 @@
+import json
+import subprocess
+import sys
+
+from scripts.load_test import PROJECT_ROOT, compare
+
+
+def test_load_test_smoke_run_writes_results(tmp_path):
+    out = tmp_path / "results.json"
+    subprocess.run([sys.executable, "scripts/load_test.py", "--customers", "5", "--products", "5",
+                    "--orders", "10", "--requests", "3", "--concurrency", "2", "--output", str(out)],
+                   cwd=PROJECT_ROOT, capture_output=True, text=True, check=True, timeout=300)
+    results = json.loads(out.read_text())
+    assert "GET /orders/customer/<id>/history" in results["routes"]
+    for name, route in results["routes"].items():
+        assert route["errors"] == 0, name
+        assert route["p50_ms"] <= route["p95_ms"] <= route["p99_ms"] <= route["max_ms"]
+
+
+def test_compare_flags_throughput_regressions():
+    baseline = {"routes": {"GET /": {"requests_per_sec": 100.0}, "GET /x": {"requests_per_sec": 100.0}}}
+    current = {"routes": {"GET /": {"requests_per_sec": 70.0}, "GET /x": {"requests_per_sec": 95.0}}}
+    assert [r[0] for r in compare(current, baseline, 0.2)] == ["GET /"]
@@ -0,0 +1,54 @@
+import io
+import json
+
+from app import metrics
+from app.config import Config
+
+
+def test_emf_line_per_request(client, capsys):
+    client.post("/products/", json={"product_id": "MT1", "product_name": "Metered"})
+    capsys.readouterr()
+
+    client.get("/products/MT1?fields=product_name")
+    lines = [json.loads(l) for l in capsys.readouterr().out.splitlines() if l.startswith("{")]
+    doc = lines[-1]
+    assert doc["_aws"]["CloudWatchMetrics"][0]["Namespace"] == Config.METRICS_NAMESPACE
+    assert doc["Route"] == "/products/<product_id>"
+    assert doc["Method"] == "GET"
+    assert doc["DynamoDBCalls"] == 1
+    assert doc["Latency"] > 0
+
+
+def test_summary_mode_reports_percentiles(monkeypatch):
+    monkeypatch.setattr(Config, "METRICS_MODE", "summary")
+    from app import create_app
+    client = create_app().test_client()
+    metrics.reset()
+
+    for _ in range(5):
+        client.get("/")
+    client.post("/customers/", json={"customer_id": "MT2", "company_name": "Summary"})
+
+    rows = metrics.summary()
+    assert rows["GET /"]["count"] == 5
+    assert rows["GET /"]["ddb_calls"] == 0
+    assert rows["POST /customers/"]["ddb_calls"] >= 1
+    assert rows["GET /"]["p50_ms"] <= rows["GET /"]["p99_ms"]
+
+    out = io.StringIO()
+    metrics.print_summary(out)
+    assert "POST /customers/" in out.getvalue()
+    metrics.reset()
+
+
+def test_streamed_response_is_measured_when_the_stream_closes(client, capsys):
+    client.post("/products/", json={"product_id": "MT3", "product_name": "Streamed"})
+    capsys.readouterr()
+
+    resp = client.get("/products/", headers={"Accept": "application/x-ndjson"})
+    assert resp.data
+    resp.close()
+    lines = [json.loads(l) for l in capsys.readouterr().out.splitlines() if l.startswith('{"_aws"')]
+    doc = lines[-1]
+    assert doc["Route"] == "/products/"
+    assert doc["DynamoDBCalls"] >= Config.SCAN_SEGMENTS
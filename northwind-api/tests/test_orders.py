@@ -0,0 +1,198 @@
+import json
+from datetime import datetime
+
+from app.services.order_service import OrderService
+
+def _order(order_id, customer_id, **extra):
+    data = {"order_id": order_id, "customer_id": customer_id,
+            "items": [{"product_id": "P1", "quantity": 2, "unit_price": 5.0}]}
+    data.update(extra)
+    return data
+
+def test_customer_history_streams_ndjson(client):
+    OrderService.create(_order("NDJ1", "CNDJ"))
+    OrderService.create(_order("NDJ2", "CNDJ"))
+
+    resp = client.get("/orders/customer/CNDJ/history",
+                      headers={"Accept": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    lines = [json.loads(l) for l in resp.get_data(as_text=True).splitlines()]
+    assert sorted(o["order_id"] for o in lines) == ["NDJ1", "NDJ2"]
+
+    resp = client.get("/orders/customer/CNDJ/history")
+    assert resp.mimetype == "application/json"
+    assert len(resp.get_json()["items"]) == 2
+
+def test_ndjson_stream_is_capped(client, monkeypatch):
+    from app.config import Config
+    monkeypatch.setattr(Config, "NDJSON_MAX_ITEMS", 1)
+    OrderService.create(_order("NDC1", "CNDC"))
+    OrderService.create(_order("NDC2", "CNDC"))
+
+    resp = client.get("/orders/customer/CNDC/history", headers={"Accept": "application/x-ndjson"})
+    assert resp.headers["X-NDJSON-Max-Items"] == "1"
+    lines = [json.loads(l) for l in resp.get_data(as_text=True).splitlines()]
+    assert len(lines) == 2 and lines[-1] == {"truncated": True}
+
+def test_bulk_create_orders(client):
+    resp = client.post("/orders/bulk", json=[_order(f"BLK{i}", "CBLK") for i in range(3)])
+    assert resp.status_code == 201
+    assert resp.get_json()["created"] == 3
+    assert len(OrderService.order_history("CBLK")) == 3
+
+def test_update_order_is_partial_and_404s_when_missing():
+    OrderService.create(_order("UPD1", "CUPD", ship_via="Air"))
+
+    updated = OrderService.update("UPD1", {"ship_via": "Sea"})
+    assert updated["ship_via"] == "Sea"
+    assert updated["items"][0]["product_id"] == "P1"
+
+    assert OrderService.update("UPD-missing", {"ship_via": "Sea"}) is None
+    assert OrderService.get("UPD-missing") is None
+
+def test_customer_history_with_sparse_fields(client):
+    OrderService.create(_order("SPF1", "CSPF", ship_via="Air"))
+    orders = client.get("/orders/customer/CSPF/history?fields=ship_via").get_json()["items"]
+    assert len(orders) == 1
+    assert set(orders[0]) == {"order_id", "customer_id", "order_date", "ship_via"}
+
+def test_customer_history_date_range_newest_first_and_paged(client):
+    for day in range(1, 6):
+        OrderService.create(_order(f"DR{day}", "CDR", order_date=datetime(2025, 3, day, 12)))
+
+    resp = client.get("/orders/customer/CDR/history?from=2025-03-02&to=2025-03-04&limit=2")
+    page = resp.get_json()
+    assert [o["order_id"] for o in page["items"]] == ["DR4", "DR3"]
+    assert page["next_token"]
+
+    page = client.get("/orders/customer/CDR/history?from=2025-03-02&to=2025-03-04&limit=2"
+                      f"&next_token={page['next_token']}").get_json()
+    assert [o["order_id"] for o in page["items"]] == ["DR2"]
+
+    page = client.get("/orders/customer/CDR/history?order=asc").get_json()
+    assert [o["order_id"] for o in page["items"]] == [f"DR{d}" for d in range(1, 6)]
+
+    assert client.get("/orders/customer/CDR/history?from=yesterday").status_code == 400
+
+def test_history_expand_products_inlines_current_product(client):
+    from app.services.product_service import ProductService
+    ProductService.create({"product_id": "EXP1", "product_name": "Expanded", "unit_price": 4.0})
+    order = _order("EXO1", "CEXP")
+    order["items"] = [{"product_id": "EXP1", "quantity": 1}, {"product_id": "EXP-gone", "quantity": 1}]
+    OrderService.create(order)
+
+    items = client.get("/orders/customer/CEXP/history?expand=products").get_json()["items"][0]["items"]
+    assert items[0]["product"]["product_name"] == "Expanded"
+    assert items[1]["product"] is None
+
+    assert client.get("/orders/EXO1?expand=customers").status_code == 400
+
+def test_order_totals_are_stored_on_write():
+    order = _order("TOT1", "CTOT")
+    order["items"].append({"product_id": "P2", "quantity": 3, "unit_price": 1.5})
+    created = OrderService.create(order)
+    assert (created["line_count"], created["item_count"], created["subtotal"]) == (2, 5, 14.5)
+
+    updated = OrderService.update("TOT1", {"items": [{"product_id": "P1", "quantity": 1, "unit_price": 2.0}]})
+    assert (updated["line_count"], updated["item_count"], updated["subtotal"]) == (1, 1, 2.0)
+    assert OrderService.get("TOT1", ["order_id", "subtotal"]) == {"order_id": "TOT1", "subtotal": 2.0}
+
+def test_pending_orders_come_from_the_sparse_index(client):
+    for i, day in enumerate([3, 1, 2]):
+        OrderService.create(_order(f"PD{i}", "CPD", ship_via="Drone",
+                                   order_date=datetime(2024, 5, day)))
+    OrderService.create(_order("PD-shipped", "CPD", ship_via="Drone",
+                               order_date=datetime(2024, 5, 1), shipped_date=datetime(2024, 5, 2)))
+
+    first = client.get("/orders/pending?ship_via=Drone&limit=2").get_json()
+    assert [o["order_id"] for o in first["items"]] == ["PD1", "PD2"]
+    assert "pending_key" not in first["items"][0]
+    rest = client.get(f"/orders/pending?ship_via=Drone&next_token={first['next_token']}").get_json()
+    assert [o["order_id"] for o in rest["items"]] == ["PD0"]
+    assert rest["next_token"] is None
+
+    OrderService.update("PD1", {"shipped_date": datetime(2024, 5, 4)})
+    OrderService.update("PD2", {"ship_via": "Barge"})
+    drone = client.get("/orders/pending?ship_via=Drone").get_json()["items"]
+    assert [o["order_id"] for o in drone] == ["PD0"]
+    barge = client.get("/orders/pending?ship_via=Barge").get_json()["items"]
+    assert [o["order_id"] for o in barge] == ["PD2"]
+
+    OrderService.update("PD1", {"shipped_date": None})
+    every = [json.loads(line)["order_id"] for line in
+             client.get("/orders/pending", headers={"Accept": "application/x-ndjson"}).data.splitlines()]
+    assert {"PD0", "PD1", "PD2"} <= set(every) and "PD-shipped" not in every
+
+def test_orders_by_date_range_read_only_the_days_asked_for(client, monkeypatch):
+    placed = [datetime(2022, 3, 1, 9), datetime(2022, 3, 1, 17), datetime(2022, 3, 3, 8),
+              datetime(2022, 3, 4, 12), datetime(2022, 3, 6, 23, 30), datetime(2022, 3, 7, 1)]
+    for i, when in enumerate(placed):
+        OrderService.create(_order(f"DRG{i}", "CDRG", order_date=when))
+
+    streamed = client.get("/orders/?from=2022-03-01&to=2022-03-06",
+                          headers={"Accept": "application/x-ndjson"})
+    assert [json.loads(line)["order_id"] for line in streamed.data.splitlines()] == \
+        ["DRG0", "DRG1", "DRG2", "DRG3", "DRG4"]
+
+    # one-item pages and a two-day window still come out in order
+    from app.config import Config
+    monkeypatch.setattr(Config, "MAX_PAGE_SIZE", 1)
+    monkeypatch.setattr(Config, "DATE_BUCKET_CONCURRENCY", 2)
+    paged = OrderService.list_by_date_range(datetime(2022, 3, 1), datetime(2022, 3, 7, 23))
+    assert [o["order_id"] for o in paged] == [f"DRG{i}" for i in range(6)]
+
+    seen, token = [], None
+    while True:
+        url = "/orders/?from=2022-03-01T12:00:00&to=2022-03-07&limit=2&fields=order_id"
+        body = client.get(url + (f"&next_token={token}" if token else "")).get_json()
+        assert len(body["items"]) <= 2
+        assert all(set(o) == {"order_id"} for o in body["items"])
+        seen.extend(o["order_id"] for o in body["items"])
+        token = body["next_token"]
+        if not token:
+            break
+    assert seen == ["DRG1", "DRG2", "DRG3", "DRG4", "DRG5"]
+
+def test_orders_by_date_range_validates_bounds(client):
+    assert client.get("/orders/?from=2022-03-01").status_code == 400
+    assert client.get("/orders/?from=2022-03-05&to=2022-03-01").status_code == 400
+    assert client.get("/orders/?from=2000-01-01&to=2022-03-01").status_code == 400
+
+def test_backfill_queues_existing_unshipped_orders(client):
+    from app.models.order import OrderModel, OrderItem
+    from scripts.backfill_indexes import backfill
+    OrderModel(order_id="BFO1", customer_id="CBF", ship_via="Sled", order_date=datetime(2023, 1, 2),
+               items=[OrderItem(product_id="P1", quantity=1)]).save()
+    assert client.get("/orders/pending?ship_via=Sled").get_json()["items"] == []
+
+    backfill("orders")
+    rows = client.get("/orders/pending?ship_via=Sled").get_json()["items"]
+    assert [o["order_id"] for o in rows] == ["BFO1"]
+
+def test_backfill_adds_the_day_key_to_existing_orders(client):
+    from app.models.order import OrderModel, OrderItem
+    from scripts.backfill_indexes import backfill
+    OrderModel(order_id="BFD1", customer_id="CBF", order_date=datetime(2021, 6, 15, 9),
+               shipped_date=datetime(2021, 6, 16), items=[OrderItem(product_id="P1", quantity=1)]).save()
+    assert client.get("/orders/?from=2021-06-15&to=2021-06-16").get_json()["items"] == []
+
+    backfill("orders")
+    rows = client.get("/orders/?from=2021-06-15&to=2021-06-16").get_json()["items"]
+    assert [o["order_id"] for o in rows] == ["BFD1"]
+
+def test_date_bounds_mixing_naive_and_aware_values(client):
+    for url in ("/orders/?from=2025-01-01T00:00:00Z&to=2025-01-02",
+                "/orders/?from=2025-01-01&to=2025-01-02T00:00:00%2B02:00",
+                "/orders/customer/CNONE/history?from=2025-01-01T00:00:00Z&to=2025-01-02"):
+        assert client.get(url).status_code == 200, url
+    assert client.get("/orders/?from=2025-01-02T00:00:00Z&to=2025-01-01").status_code == 400
+
+def test_history_on_the_legacy_customer_index_filters_dates(client, monkeypatch):
+    from app.config import Config
+    monkeypatch.setattr(Config, "ORDER_HISTORY_INDEX", "customerId-index")
+    for day in (1, 2, 3):
+        OrderService.create(_order(f"LG{day}", "CLG", order_date=datetime(2025, 4, day, 12)))
+
+    body = client.get("/orders/customer/CLG/history?from=2025-04-02").get_json()
+    assert sorted(o["order_id"] for o in body["items"]) == ["LG2", "LG3"]
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from app.services.parallel_scan import parallel_scan
+
+
+class FakeModel:
+    """Stands in for a PynamoDB model: item i belongs to segment i % total_segments."""
+    rows = list(range(100))
+    seen_segments = set()
+    lock = threading.Lock()
+
+    @classmethod
+    def scan(cls, segment, total_segments, **kwargs):
+        with cls.lock:
+            cls.seen_segments.add(segment)
+        for r in cls.rows:
+            if r % total_segments == segment:
+                yield r
+
+
+class BrokenModel:
+    @classmethod
+    def scan(cls, segment, total_segments, **kwargs):
+        yield 1
+        raise RuntimeError("segment %d failed" % segment)
+
+
+def test_parallel_scan_merges_all_segments():
+    FakeModel.seen_segments = set()
+    result = list(parallel_scan(FakeModel, total_segments=4, max_buffered=3))
+    assert sorted(result) == FakeModel.rows
+    assert FakeModel.seen_segments == {0, 1, 2, 3}
+
+
+def test_parallel_scan_stops_workers_when_consumer_leaves():
+    gen = parallel_scan(FakeModel, total_segments=4, max_buffered=1)
+    assert next(gen) in FakeModel.rows
+    gen.close()  # must not hang on blocked workers
+
+
+def test_parallel_scan_reraises_worker_errors():
+    with pytest.raises(RuntimeError):
+        list(parallel_scan(BrokenModel, total_segments=2))
@@ -0,0 +1,107 @@
+from app.services.product_service import ProductService
+from app.services.pagination import decode_token, encode_token
+
+def test_list_page_walks_whole_table():
+    for i in range(5):
+        ProductService.create({"product_id": f"PG{i}", "product_name": f"Paged {i}"})
+
+    seen, token = [], None
+    while True:
+        page = ProductService.list_page(2, decode_token(token))
+        assert len(page["items"]) <= 2
+        seen.extend(p["product_id"] for p in page["items"])
+        token = page["next_token"]
+        if not token:
+            break
+    assert {f"PG{i}" for i in range(5)} <= set(seen)
+    assert len(seen) == len(set(seen))
+
+def test_token_round_trip():
+    key = {"product_id": {"S": "PG1"}}
+    assert decode_token(encode_token(key)) == key
+
+def test_list_products_rejects_bad_token(client):
+    resp = client.get("/products/?next_token=not-a-token")
+    assert resp.status_code == 400
+
+def test_batch_get_products_keeps_order_and_reports_missing(client):
+    for i in range(3):
+        ProductService.create({"product_id": f"BG{i}", "product_name": f"Batch {i}"})
+
+    resp = client.post("/products/batch-get", json={"ids": ["BG2", "NOPE", "BG0", "BG2"]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert [p["product_id"] for p in body["items"]] == ["BG2", "BG0"]
+    assert body["missing"] == ["NOPE"]
+
+def test_batch_get_products_validates_ids(client):
+    assert client.post("/products/batch-get", json={"ids": []}).status_code == 400
+
+def test_bulk_create_products(client):
+    payload = [{"product_id": f"BK{i}", "product_name": f"Bulk {i}"} for i in range(30)]
+    payload.append({"product_id": "BK0", "product_name": "Duplicate"})
+
+    resp = client.post("/products/bulk", json=payload)
+    assert resp.status_code == 207
+    body = resp.get_json()
+    assert body["created"] == 30 and body["failed"] == 1
+    assert body["results"][-1]["status"] == "failed"
+    assert ProductService.get("BK29")["product_name"] == "Bulk 29"
+
+def test_bulk_create_products_reports_validation_errors_per_item(client):
+    resp = client.post("/products/bulk", json=[{"product_id": "BKX", "product_name": "ok"},
+                                               {"product_id": "BKY"}])
+    assert resp.status_code == 400
+    assert "1" in resp.get_json()["error"]
+
+def test_get_product_with_sparse_fields(client):
+    ProductService.create({"product_id": "SF1", "product_name": "Sparse",
+                           "unit_price": 3.5, "category": "Tools", "units_in_stock": 7})
+
+    resp = client.get("/products/SF1?fields=product_name,unit_price")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"product_id": "SF1", "product_name": "Sparse", "unit_price": 3.5}
+
+    page = client.get("/products/?fields=product_name&limit=1000").get_json()
+    assert all(set(p) <= {"product_id", "product_name"} for p in page["items"])
+
+    assert client.get("/products/SF1?fields=nope").status_code == 400
+
+def test_get_product_honours_if_none_match(client):
+    ProductService.create({"product_id": "ET1", "product_name": "Tagged"})
+    first = client.get("/products/ET1")
+    etag = first.headers["ETag"]
+
+    again = client.get("/products/ET1", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.get_data() == b""
+
+    client.patch("/products/ET1", json={"product_name": "Retagged"})
+    changed = client.get("/products/ET1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+def test_products_by_category_and_price_band(client):
+    for i, price in enumerate([4.0, 12.5, 8.0, 30.0, 15.0]):
+        ProductService.create({"product_id": f"CAT{i}", "product_name": f"Cat {i}",
+                               "category": "Cheeses", "unit_price": price})
+    ProductService.create({"product_id": "CATX", "product_name": "Other",
+                           "category": "Grains", "unit_price": 10.0})
+
+    resp = client.get("/products/?category=Cheeses&min_price=5&max_price=20")
+    assert resp.status_code == 200
+    assert [p["unit_price"] for p in resp.get_json()["items"]] == [8.0, 12.5, 15.0]
+
+    seen, token = [], None
+    while True:
+        page = ProductService.category_page("Cheeses", 2, decode_token(token))
+        seen.extend(p["product_id"] for p in page["items"])
+        token = page["next_token"]
+        if not token:
+            break
+    assert seen == ["CAT0", "CAT2", "CAT1", "CAT4", "CAT3"]
+
+def test_price_filters_require_category(client):
+    assert client.get("/products/?min_price=5").status_code == 400
+    assert client.get("/products/?category=Cheeses&max_price=cheap").status_code == 400
+    assert client.get("/products/?category=Cheeses&min_price=9&max_price=3").status_code == 400
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from app.services.product_service import ProductService
+from app.services.search import SearchIndex, product_index, tokenize
+
+
+def _index(docs, rebuild_seconds=300):
+    return SearchIndex("t", "product_name", "product_id", lambda: iter(docs), rebuild_seconds)
+
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Pâté Chinois, 24-pack") == ["pate", "chinois", "24", "pack"]
+
+
+def test_prefix_search_requires_every_term_and_ranks_whole_words_first():
+    idx = _index([
+        {"product_id": "1", "product_name": "Chai"},
+        {"product_id": "2", "product_name": "Chang"},
+        {"product_id": "3", "product_name": "Chai Latte Mix"},
+        {"product_id": "4", "product_name": "Green Chai Tea"},
+    ])
+    assert [d["product_id"] for d in idx.search("cha", 10)] == ["1", "2", "3", "4"]
+    assert [d["product_id"] for d in idx.search("chai", 10)] == ["1", "3", "4"]
+    assert [d["product_id"] for d in idx.search("chai t", 10)] == ["4"]
+    assert [d["product_id"] for d in idx.search("cha", 2)] == ["1", "2"]
+    assert idx.search("coffee", 10) == []
+
+
+def test_incremental_updates_and_periodic_rebuild():
+    docs = [{"product_id": "1", "product_name": "Tofu"}]
+    idx = _index(docs, rebuild_seconds=0)
+    idx.upsert({"product_id": "2", "product_name": "Ignored until built"})
+    assert [d["product_id"] for d in idx.search("tofu", 10)] == ["1"]
+
+    idx.upsert({"product_id": "1", "product_name": "Konbu"})
+    assert idx.search("tofu", 10) == []
+    idx.remove("1")
+    assert idx.search("konbu", 10) == []
+    assert idx.stats()["tokens"] == 0
+
+    stale = _index(docs, rebuild_seconds=0.000001)
+    stale.ensure_built()
+    docs.append({"product_id": "3", "product_name": "Tofu Skin"})
+    time.sleep(0.001)
+    stale.search("tofu", 10)  # served from the old index, schedules a rebuild
+    for _ in range(200):
+        if len(stale.search("tofu", 10)) == 2:
+            break
+        time.sleep(0.01)
+    assert [d["product_id"] for d in stale.search("tofu", 10)] == ["1", "3"]
+
+
+def test_rebuild_does_not_block_writes_and_keeps_them():
+    loading, release = threading.Event(), threading.Event()
+
+    def slow_loader():
+        yield {"product_id": "1", "product_name": "Ikura"}
+        loading.set()
+        release.wait(5)
+
+    idx = SearchIndex("t", "product_name", "product_id", slow_loader, 300)
+    builder = threading.Thread(target=idx.ensure_built)
+    builder.start()
+    assert loading.wait(5)
+    idx.upsert({"product_id": "2", "product_name": "Ikura Roe"})  # must not wait for the scan
+    idx.remove("1")
+    release.set()
+    builder.join(5)
+    assert [d["product_id"] for d in idx.search("ikura", 10)] == ["2"]
+
+
+def test_search_route_tracks_writes(client):
+    ProductService.create({"product_id": "SR1", "product_name": "Gorgonzola Telino"})
+    resp = client.get("/products/search?q=gorg")
+    assert resp.status_code == 200
+    assert [p["product_id"] for p in resp.get_json()["items"]] == ["SR1"]
+    assert product_index.built
+
+    ProductService.create({"product_id": "SR2", "product_name": "Gorgonzola Dolce"})
+    ProductService.update("SR1", {"product_name": "Mascarpone Fabioli"})
+    items = client.get("/products/search?q=gorgonzola").get_json()["items"]
+    assert [p["product_id"] for p in items] == ["SR2"]
+
+
+def test_search_route_validates_query(client):
+    assert client.get("/products/search").status_code == 400
+    assert client.get("/products/search?q=x&limit=0").status_code == 400